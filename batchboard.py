@@ -0,0 +1,289 @@
+'''/////////////////////////////////////////////////////////
+File name: batchboard.py
+File function: A batch of boards stores N independent
+games of the same board shape as one 3D NumPy array of
+booleans (True means an occupied square), indexed as
+[game][row][column]. The row 0 and column 0 of every
+board correspond, as in the GameBoard class, to the
+lower-left corner.
+All the games are advanced in lockstep: the legal
+locations of a block, the placement of the blocks and the
+detection and clearing of the full rows and columns are
+computed for all the boards at once with vectorized
+operations, following the same rules as the place_block
+and _simple methods of the MyPlayer class.
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library numpy is needed to store and operate all the boards at once.
+import numpy as np
+
+from gameboard import *
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+
+###########################################################
+#                          TYPES
+###########################################################
+
+###########################################################
+#                         CLASSES
+###########################################################
+class BatchGameBoard:
+    #************************************
+    # Processes and Functions
+    #************************************
+
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             count: Number of games of the batch.
+    *             shape: Shape of every board.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, count, shape):
+        # Having at least one game is essential to keep going with the task.
+        assert count > 0, 'A batch of boards needs at least one game.'
+        self._count = count
+        self._shape = shape
+        # All the boards are kept in a single array of size
+        # (count x height x width), initialized with empty squares.
+        self._boards = np.zeros((count, shape.height, shape.width), dtype = bool)
+        # A game is alive until a block cannot be placed on its board.
+        self._alive = np.ones(count, dtype = bool)
+        # Indexes of the rows and columns of a board, shaped to be
+        # broadcasted against the whole batch.
+        self._rows = np.arange(shape.height).reshape(1, shape.height, 1)
+        self._columns = np.arange(shape.width).reshape(1, 1, shape.width)
+        self._games = np.arange(count).reshape(count, 1, 1)
+
+    '''----------------------------------------------------
+    * Name: __len__
+    * Function: Gives the number of games of the batch.
+    * Parameters: self: Instance of the class.
+    * Return: The number of games.
+    ----------------------------------------------------'''
+    def __len__(self):
+        return self._count
+
+    '''----------------------------------------------------
+    * Name: get_shape
+    * Function: Gives the shape of the boards.
+    * Parameters: self: Instance of the class.
+    * Return: The shape shared by all the boards.
+    ----------------------------------------------------'''
+    def get_shape(self):
+        return self._shape
+
+    '''----------------------------------------------------
+    * Name: get_boards
+    * Function: Gives the array with all the boards. It
+    *           is not a copy, so it must not be modified
+    *           by the user.
+    * Parameters: self: Instance of the class.
+    * Return: An array of size (count x height x width).
+    ----------------------------------------------------'''
+    def get_boards(self):
+        return self._boards
+
+    '''----------------------------------------------------
+    * Name: get_alive
+    * Function: Says which games are still being played.
+    * Parameters: self: Instance of the class.
+    * Return: An array of booleans, one per game.
+    ----------------------------------------------------'''
+    def get_alive(self):
+        return self._alive
+
+    '''----------------------------------------------------
+    * Name: get_board
+    * Function: Builds a GameBoard with the same squares
+    *           occupied as one of the boards of the batch.
+    * Parameters: self: Instance of the class.
+    *             game: Index of the game.
+    * Return: A new object of the class GameBoard.
+    ----------------------------------------------------'''
+    def get_board(self, game):
+        board = GameBoard(self._shape)
+        # The algorithm is O(w x h), with w the width of the board and h
+        # its height.
+        for i, j in zip(*np.nonzero(self._boards[game])):
+            board.put(Location(int(i), int(j)))
+        return board
+
+    '''----------------------------------------------------
+    * Name: set_board
+    * Function: Copies the squares of a GameBoard into one
+    *           of the boards of the batch. Precondition:
+    *           both boards have the same shape.
+    * Parameters: self: Instance of the class.
+    *             game: Index of the game.
+    *             board: Object of the class GameBoard.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def set_board(self, game, board):
+        assert board.get_shape() == self._shape, 'The board given does not have the shape of the batch.'
+        # The algorithm is O(w x h), with w the width of the board and h
+        # its height.
+        for i in range(0, self._shape.height):
+            for j in range(0, self._shape.width):
+                self._boards[game, i, j] = board.is_full(Location(i, j))
+        self._alive[game] = True
+        return self
+
+    '''----------------------------------------------------
+    * Name: legal_locations
+    * Function: Says, for every game and every location,
+    *           if the block of that game can be placed
+    *           there. It is computed from the summed-area
+    *           table of the boards, so any location is
+    *           checked in O(1) whatever the block size.
+    * Parameters: self: Instance of the class.
+    *             blocks: A Shape for all the games or a
+    *                     sequence of one Shape per game.
+    * Return: An array of booleans of size
+    *         (count x height x width).
+    ----------------------------------------------------'''
+    def legal_locations(self, blocks):
+        widths, heights = self._block_dimensions(blocks)
+        height, width = self._shape.height, self._shape.width
+        # The summed-area table keeps, on the position (i, j), the number of
+        # tockens with row lower than i and column lower than j.
+        # The algorithm is O(n x w x h), with n the number of games, w the
+        # width of the board and h its height.
+        table = np.zeros((self._count, height + 1, width + 1), dtype = np.int32)
+        np.cumsum(self._boards, axis = 1, out = table[:, 1:, 1:])
+        np.cumsum(table[:, 1:, 1:], axis = 2, out = table[:, 1:, 1:])
+        # Upper row and right column (not included) of the block placed on
+        # each location, limited to the board so the table can be indexed.
+        top = self._rows + heights.reshape(-1, 1, 1)
+        right = self._columns + widths.reshape(-1, 1, 1)
+        top_clipped = np.minimum(top, height)
+        right_clipped = np.minimum(right, width)
+        # Number of tockens under the block placed on each location.
+        tockens = (table[self._games, top_clipped, right_clipped]
+                   - table[self._games, self._rows, right_clipped]
+                   - table[self._games, top_clipped, self._columns]
+                   + table[self._games, self._rows, self._columns])
+        # As in the is_empty method of the GameBoard class, a block which
+        # goes out of the board cannot be placed.
+        return (tockens == 0) & (top <= height) & (right <= width)
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Finds, for every game, the location that
+    *           the simple method of the MyPlayer class
+    *           would choose: the legal one with the lowest
+    *           row and, in the same row, with the lowest
+    *           column.
+    * Parameters: self: Instance of the class.
+    *             blocks: A Shape for all the games or a
+    *                     sequence of one Shape per game.
+    * Return: Three arrays, one value per game: the rows
+    *         and columns found and whether a location was
+    *         found or not.
+    ----------------------------------------------------'''
+    def first_fit(self, blocks):
+        legal = self.legal_locations(blocks).reshape(self._count, -1)
+        # Flattening the boards row by row, the first legal position is the
+        # one with the lowest row and, then, the lowest column.
+        first = np.argmax(legal, axis = 1)
+        found = legal[np.arange(self._count), first] & self._alive
+        rows, columns = np.divmod(first, self._shape.width)
+        return rows, columns, found
+
+    '''----------------------------------------------------
+    * Name: place_blocks
+    * Function: Puts the blocks on the boards of the games
+    *           selected. Precondition: the locations are
+    *           legal (see legal_locations).
+    * Parameters: self: Instance of the class.
+    *             rows: Row of the location of each game.
+    *             columns: Column of the location of each
+    *                      game.
+    *             blocks: A Shape for all the games or a
+    *                     sequence of one Shape per game.
+    *             selected: Array of booleans saying which
+    *                       games get their block. If it is
+    *                       not specified, all the games
+    *                       alive are selected.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def place_blocks(self, rows, columns, blocks, selected = None):
+        widths, heights = self._block_dimensions(blocks)
+        if selected is None: selected = self._alive
+        rows = np.asarray(rows).reshape(-1, 1, 1)
+        columns = np.asarray(columns).reshape(-1, 1, 1)
+        # The squares covered by the block of each game are the ones between
+        # its location and its location plus its dimensions.
+        # The algorithm is O(n x w x h), with n the number of games, w the
+        # width of the board and h its height.
+        covered = ((self._rows >= rows) & (self._rows < rows + heights.reshape(-1, 1, 1))
+                   & (self._columns >= columns) & (self._columns < columns + widths.reshape(-1, 1, 1)))
+        self._boards |= covered & np.asarray(selected).reshape(-1, 1, 1)
+        return self
+
+    '''----------------------------------------------------
+    * Name: clear_full_lines
+    * Function: Clears the full rows and columns of all
+    *           the boards. As in the place_block method
+    *           of the MyPlayer class, the full rows are
+    *           cleared first and, then, the columns that
+    *           are still full.
+    * Parameters: self: Instance of the class.
+    * Return: Two arrays with the number of rows and
+    *         columns cleared on each board.
+    ----------------------------------------------------'''
+    def clear_full_lines(self):
+        # The algorithm is O(n x w x h), with n the number of games, w the
+        # width of the board and h its height.
+        full_rows = self._boards.all(axis = 2)
+        self._boards &= ~full_rows[:, :, np.newaxis]
+        full_columns = self._boards.all(axis = 1)
+        self._boards &= ~full_columns[:, np.newaxis, :]
+        return full_rows.sum(axis = 1), full_columns.sum(axis = 1)
+
+    '''----------------------------------------------------
+    * Name: step
+    * Function: Advances all the games alive one move: the
+    *           block of each game is placed on the location
+    *           chosen by the simple method and then the full
+    *           rows and columns are cleared. The games where
+    *           the block cannot be placed are over.
+    * Parameters: self: Instance of the class.
+    *             blocks: A Shape for all the games or a
+    *                     sequence of one Shape per game.
+    * Return: Four arrays, one value per game: the rows
+    *         and columns of the locations, whether the
+    *         block was placed and the number of lines
+    *         (rows and columns) cleared.
+    ----------------------------------------------------'''
+    def step(self, blocks):
+        rows, columns, found = self.first_fit(blocks)
+        self._alive &= found
+        self.place_blocks(rows, columns, blocks, found)
+        cleared_rows, cleared_columns = self.clear_full_lines()
+        return rows, columns, found, cleared_rows + cleared_columns
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _block_dimensions
+    * Function: Gives the widths and heights of the blocks
+    *           of all the games.
+    * Parameters: self: Instance of the class.
+    *             blocks: A Shape for all the games or a
+    *                     sequence of one Shape per game.
+    * Return: Two arrays with one width and one height per
+    *         game.
+    ----------------------------------------------------'''
+    def _block_dimensions(self, blocks):
+        dimensions = np.broadcast_to(np.asarray(blocks, dtype = np.intp), (self._count, 2))
+        return dimensions[:, 0], dimensions[:, 1]
@@ -0,0 +1,202 @@
+'''/////////////////////////////////////////////////////////
+File name: blockpuzzleenv.py
+File function: An environment, in the style of the Gym
+ones, to play the Blocks Puzzle step by step. The game
+is kept only by a batch of one board of the class
+BatchGameBoard, which gives the observations as NumPy
+arrays. An object of the class MyPlayer can still be
+asked for a location: its board is copied from the batch
+when it is asked for (see get_player), so the moves are
+never made on two boards.
+The observations are read-only views of that board: no
+copy of the board is made on each step, so they always
+show the current state of the game. A copy must be made
+by the user to keep an old state.
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library random is needed to generate the sequence of blocks.
+import random
+
+import numpy as np
+
+from myplayer import *
+from batchboard import BatchGameBoard
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+
+###########################################################
+#                          TYPES
+###########################################################
+
+###########################################################
+#                         CLASSES
+###########################################################
+class BlockPuzzleEnv:
+    #************************************
+    # Processes and Functions
+    #************************************
+
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             width: Width of the board.
+    *             height: Height of the board.
+    *             method: Method of the player (see the
+    *                     MyPlayer class).
+    *             max_block: Shape of the biggest block
+    *                        that can be generated. The
+    *                        blocks have random width and
+    *                        height between 1 and its ones.
+    *             seed: Seed of the sequence of blocks.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, width, height, method = 'simple', max_block = Shape(3, 3), seed = None):
+        self._shape = Shape(width, height)
+        self._method = method
+        self._max_block = max_block
+        self._random = random.Random(seed)
+        self.reset()
+
+    '''----------------------------------------------------
+    * Name: reset
+    * Function: Starts a new game with an empty board.
+    * Parameters: self: Instance of the class.
+    *             seed: If it is specified, new seed of
+    *                   the sequence of blocks.
+    * Return: The observation and the information of the
+    *         new game (see the step method).
+    ----------------------------------------------------'''
+    def reset(self, seed = None):
+        if seed is not None: self._random.seed(seed)
+        self._player = MyPlayer(self._shape.width, self._shape.height, self._method)
+        # Moves of the game, and if the board of the player is the one of the
+        # batch (it is only copied when the player is asked for).
+        self._moves = 0
+        self._player_synced = True
+        self._batch = BatchGameBoard(1, self._shape)
+        # The observation of the board is a view of the only board of the
+        # batch, so it is updated with it. It is made read-only in order not
+        # to let the user modify the game.
+        self._board = self._batch.get_boards()[0].view()
+        self._board.flags.writeable = False
+        self._block_array = np.zeros(2, dtype = np.intp)
+        self._block_view = self._block_array.view()
+        self._block_view.flags.writeable = False
+        self._next_block()
+        return self._observation(), self._info()
+
+    '''----------------------------------------------------
+    * Name: step
+    * Function: Places the current block on the location
+    *           given, clears the full rows and columns and
+    *           gives a new block. Precondition: the block
+    *           can be placed on the location (see the
+    *           action mask), otherwise the function gives
+    *           an assertion error.
+    * Parameters: self: Instance of the class.
+    *             action: Location of the block, or its
+    *                     index on the action mask once
+    *                     flattened (row x width + column).
+    * Return: A tuple with the observation (the board, the
+    *         block and the action mask), the reward (the
+    *         number of rows and columns cleared), if the
+    *         game is over, if it has been truncated (never)
+    *         and a dictionary with information.
+    ----------------------------------------------------'''
+    def step(self, action):
+        if not isinstance(action, Location):
+            action = Location(*divmod(int(action), self._shape.width))
+        # The bounds are checked first, as a negative index would read the
+        # mask from its other end.
+        assert (0 <= action.row < self._shape.height and 0 <= action.column < self._shape.width
+                and self._mask[action.row, action.column]), 'The block cannot be placed on the location given.'
+        # The batch clears the lines with the same rules as the place_block
+        # method of the player.
+        self._batch.place_blocks([action.row], [action.column], self._block)
+        cleared_rows, cleared_columns = self._batch.clear_full_lines()
+        reward = int(cleared_rows[0] + cleared_columns[0])
+        self._moves += 1
+        self._player_synced = False
+        self._next_block()
+        terminated = not self._mask.any()
+        return self._observation(), reward, terminated, False, self._info()
+
+    '''----------------------------------------------------
+    * Name: get_player
+    * Function: Gives the player of the game, which can be
+    *           used to ask its strategy for a location. If
+    *           there have been moves since the last time it
+    *           was asked for, the board of the batch is
+    *           copied into it first, in O(w x h), with w the
+    *           width of the board and h its height. The
+    *           player must not be used to place blocks: the
+    *           moves are made with the step method.
+    * Parameters: self: Instance of the class.
+    * Return: The object of the class MyPlayer.
+    ----------------------------------------------------'''
+    def get_player(self):
+        if not self._player_synced:
+            state = self._player.get_state()
+            state['board'] = tuple(sum(1 << int(j) for j in np.flatnonzero(row))
+                                   for row in self._batch.get_boards()[0])
+            # The locations where the searches of the player start are only
+            # known for the moves it has seen.
+            state['first_fit'] = []
+            state['moves'] = self._moves
+            self._player.set_state(state)
+            self._player_synced = True
+        return self._player
+
+    '''----------------------------------------------------
+    * Name: get_block
+    * Function: Gives the block that must be placed.
+    * Parameters: self: Instance of the class.
+    * Return: The current block, of type Shape.
+    ----------------------------------------------------'''
+    def get_block(self):
+        return self._block
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _next_block
+    * Function: Generates a new block and computes the
+    *           locations where it can be placed.
+    * Parameters: self: Instance of the class.
+    * Return: -
+    ----------------------------------------------------'''
+    def _next_block(self):
+        self._block = Shape(self._random.randint(1, self._max_block.width),
+                            self._random.randint(1, self._max_block.height))
+        self._block_array[:] = self._block
+        # The action mask is read-only too, as it is part of the observation.
+        self._mask = self._batch.legal_locations(self._block)[0]
+        self._mask.flags.writeable = False
+
+    '''----------------------------------------------------
+    * Name: _observation
+    * Function: Gives the observation of the game.
+    * Parameters: self: Instance of the class.
+    * Return: A dictionary with the views of the board,
+    *         the block (width and height) and the action
+    *         mask (legal locations of the block).
+    ----------------------------------------------------'''
+    def _observation(self):
+        return {'board': self._board, 'block': self._block_view, 'action_mask': self._mask}
+
+    '''----------------------------------------------------
+    * Name: _info
+    * Function: Gives the information of the game.
+    * Parameters: self: Instance of the class.
+    * Return: A dictionary with the block, of type Shape.
+    ----------------------------------------------------'''
+    def _info(self):
+        return {'block': self._block}
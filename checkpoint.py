@@ -0,0 +1,80 @@
+'''/////////////////////////////////////////////////////////
+File name: checkpoint.py
+File function: Checkpoints of long simulations. A
+checkpoint is a dictionary (for example, with the state
+of a player given by its get_state method, the state of
+the random generator of the blocks and the position on
+the sequence of blocks) kept on a local file, pickled and
+compressed with zlib.
+The files are written atomically: the checkpoint is first
+written to a temporary file of the same folder and then
+renamed, and the folder is synced after the rename, so a
+crash while writing never leaves a broken checkpoint and
+the previous one is kept.
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library os is needed to replace the checkpoints atomically.
+import os
+# Libraries pickle and zlib are needed to keep the checkpoints compact.
+import pickle
+import zlib
+# Library tempfile is needed to write the temporary files.
+import tempfile
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Compression level of the checkpoints (from 0 to 9).
+COMPRESSION = 6
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: save_checkpoint
+* Function: Writes a checkpoint atomically.
+* Parameters: path: File of the checkpoint.
+*             state: Dictionary to keep.
+* Return: -
+----------------------------------------------------'''
+def save_checkpoint(path, state):
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok = True)
+    data = zlib.compress(pickle.dumps(state, protocol = pickle.HIGHEST_PROTOCOL), COMPRESSION)
+    descriptor, temporary = tempfile.mkstemp(dir = folder, prefix = '.checkpoint-')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+            # The data must be on the disk before the file is renamed.
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    # The rename is kept in the folder, which must be on the disk too or a
+    # power loss could bring the previous checkpoint back. Windows cannot
+    # open a folder, and it writes the rename with the file.
+    if os.name != 'nt':
+        descriptor = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+'''----------------------------------------------------
+* Name: load_checkpoint
+* Function: Reads a checkpoint.
+* Parameters: path: File of the checkpoint.
+* Return: The dictionary kept, or None if there is no
+*         checkpoint.
+----------------------------------------------------'''
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as file:
+        return pickle.loads(zlib.decompress(file.read()))
@@ -0,0 +1,1023 @@
+'''/////////////////////////////////////////////////////////
+File name: fuzzboards.py
+File function: Differential fuzzing of the boards. Random
+sequences of operations are run on several kinds of board
+at the same time and, after each operation, the result
+and the state of every board must be the same as the ones
+of the first board, which by default is a brute-force
+reference. On the first difference, the sequence is
+shrunk to a minimal one that still shows it and is
+printed. At the end, the time spent on each operation by
+each board, compared with the first one, is reported.
+There are two modes:
+- boards: the operations of the GameBoard class (put,
+  remove, clear_rows, clear_columns, full_rows,
+  full_columns, row_counters, column_counters and
+  is_empty, with blocks of any shape, and the queries
+  answered by the optional indexes) on the GameBoard
+  classes.
+- games: the moves of a game (the legal locations of a
+  block, the one the simple method chooses and placing a
+  block, which clears the full lines) on every
+  implementation of the rules: the GameBoard classes, the
+  BatchGameBoard class, the compact boards of the
+  montecarlo.py file and the MyPlayer class itself.
+The state compared is the one drawn from the squares of
+each board, as the __str__ method of the GameBoard class
+does, not from the bitmasks the boards keep next to them.
+Usage: python fuzzboards.py [--mode M] [--runs R]
+       [--length L] [--seed S] [--backends NAME ...]
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library argparse is needed to read the options of the command line.
+import argparse
+# Library random is needed to generate the operations.
+import random
+# Library sys is needed to give the exit status.
+import sys
+# Library time is needed to measure the operations.
+import time
+
+from gameboard import *
+from batchboard import BatchGameBoard
+from myplayer import MyPlayer
+import montecarlo
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Largest width and height of the blocks generated.
+MAX_BLOCK = 4
+
+###########################################################
+#                         CLASSES
+###########################################################
+'''----------------------------------------------------
+* Name: ReferenceBoard
+* Function: A board with the interface of the GameBoard
+*           class written in the most direct way: a set
+*           of the occupied squares, and every query
+*           answered by looking at all the squares. It
+*           follows the GameBoard class even where the
+*           result of a call out of its preconditions is
+*           not obvious (the blocks of width or height 0,
+*           the locations out of the board...), so every
+*           sequence of operations can be compared.
+----------------------------------------------------'''
+class ReferenceBoard:
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, shape):
+        self._shape = shape
+        self._full = set() # Occupied squares, as (row, column) pairs.
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Draws the board as the GameBoard class
+    *           does.
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def __str__(self):
+        return draw(self._shape, lambda i, j: (i, j) in self._full)
+
+    '''----------------------------------------------------
+    * Name: get_shape
+    * Function: Gives the shape of the board.
+    * Parameters: self: Instance of the class.
+    * Return: The Shape of the board.
+    ----------------------------------------------------'''
+    def get_shape(self):
+        return self._shape
+
+    '''----------------------------------------------------
+    * Name: is_empty
+    * Function: Says if a block can be put on a location.
+    *           As in the GameBoard class, a negative row or
+    *           column is out of the board, and a block
+    *           without squares only looks at the square of
+    *           the location, which must exist.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: True if all the squares are on the board and
+    *         empty. False otherwise.
+    ----------------------------------------------------'''
+    def is_empty(self, location, shape = Shape(1, 1)):
+        if location.row < 0 or location.column < 0: return False
+        squares = self._squares(location, shape)
+        if not squares:
+            return self._square(location) not in self._full
+        return all(self._inside(square) and square not in self._full for square in squares)
+
+    '''----------------------------------------------------
+    * Name: is_full
+    * Function: Says if all the squares of a block are
+    *           occupied, as is_empty does for the empty
+    *           ones.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: True if all the squares are on the board and
+    *         occupied. False otherwise.
+    ----------------------------------------------------'''
+    def is_full(self, location, shape = Shape(1, 1)):
+        if location.row < 0 or location.column < 0: return False
+        squares = self._squares(location, shape)
+        if not squares:
+            return self._square(location) in self._full
+        return all(square in self._full for square in squares)
+
+    '''----------------------------------------------------
+    * Name: put
+    * Function: Occupies the squares of a block.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def put(self, location, shape = Shape(1, 1)):
+        assert self.is_empty(location, shape), 'The squares are occupied or out of the board.'
+        self._full.update(self._squares(location, shape))
+        return self
+
+    '''----------------------------------------------------
+    * Name: remove
+    * Function: Frees the squares of a block.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def remove(self, location, shape = Shape(1, 1)):
+        assert self.is_full(location, shape), 'The squares are not occupied.'
+        self._full.difference_update(self._squares(location, shape))
+        return self
+
+    '''----------------------------------------------------
+    * Name: clear_rows
+    * Function: Frees the rows given that are on the board.
+    * Parameters: self: Instance of the class.
+    *             rows: List of rows.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def clear_rows(self, rows):
+        rows = [i for i in rows if i < self._shape.height]
+        self._full = {(i, j) for i, j in self._full if i not in rows}
+        return self
+
+    '''----------------------------------------------------
+    * Name: clear_columns
+    * Function: Frees the columns given that are on the
+    *           board.
+    * Parameters: self: Instance of the class.
+    *             columns: List of columns.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def clear_columns(self, columns):
+        columns = [j for j in columns if j < self._shape.width]
+        self._full = {(i, j) for i, j in self._full if j not in columns}
+        return self
+
+    '''----------------------------------------------------
+    * Name: full_rows
+    * Function: Gives the rows with all squares occupied.
+    * Parameters: self: Instance of the class.
+    * Return: A list of rows.
+    ----------------------------------------------------'''
+    def full_rows(self):
+        return [i for i, count in enumerate(self.row_counters()) if count == self._shape.width]
+
+    '''----------------------------------------------------
+    * Name: full_columns
+    * Function: Gives the columns with all squares
+    *           occupied.
+    * Parameters: self: Instance of the class.
+    * Return: A list of columns.
+    ----------------------------------------------------'''
+    def full_columns(self):
+        return [j for j, count in enumerate(self.column_counters()) if count == self._shape.height]
+
+    '''----------------------------------------------------
+    * Name: row_counters
+    * Function: Counts the tockens of each row.
+    * Parameters: self: Instance of the class.
+    * Return: A list with a count per row.
+    ----------------------------------------------------'''
+    def row_counters(self):
+        return [sum((i, j) in self._full for j in range(0, self._shape.width))
+                for i in range(0, self._shape.height)]
+
+    '''----------------------------------------------------
+    * Name: column_counters
+    * Function: Counts the tockens of each column.
+    * Parameters: self: Instance of the class.
+    * Return: A list with a count per column.
+    ----------------------------------------------------'''
+    def column_counters(self):
+        return [sum((i, j) in self._full for i in range(0, self._shape.height))
+                for j in range(0, self._shape.width)]
+
+    '''----------------------------------------------------
+    * Name: encode
+    * Function: Gives the compact form of the board (see
+    *           the GameBoard class).
+    * Parameters: self: Instance of the class.
+    * Return: A tuple with an integer per row.
+    ----------------------------------------------------'''
+    def encode(self):
+        return tuple(sum(1 << j for j in range(0, self._shape.width) if (i, j) in self._full)
+                     for i in range(0, self._shape.height))
+
+    '''----------------------------------------------------
+    * Name: holes
+    * Function: Counts the empty squares under the highest
+    *           tocken of their column.
+    * Parameters: self: Instance of the class.
+    * Return: The number of holes.
+    ----------------------------------------------------'''
+    def holes(self):
+        holes = 0
+        for j in range(0, self._shape.width):
+            top = max([i for i in range(0, self._shape.height) if (i, j) in self._full], default = -1)
+            holes += sum((i, j) not in self._full for i in range(0, top))
+        return holes
+
+    '''----------------------------------------------------
+    * Name: isolated_empty_squares
+    * Function: Counts the empty squares whose neighbours
+    *           are all occupied or out of the board.
+    * Parameters: self: Instance of the class.
+    * Return: The number of isolated empty squares.
+    ----------------------------------------------------'''
+    def isolated_empty_squares(self):
+        return sum(all(not self._inside(neighbour) or neighbour in self._full
+                       for neighbour in self._neighbours(square))
+                   for square in self._empty_squares())
+
+    '''----------------------------------------------------
+    * Name: empty_regions
+    * Function: Counts the regions of empty squares
+    *           connected by their sides.
+    * Parameters: self: Instance of the class.
+    * Return: The number of empty regions.
+    ----------------------------------------------------'''
+    def empty_regions(self):
+        regions = 0
+        seen = set()
+        for square in self._empty_squares():
+            if square in seen:
+                continue
+            regions += 1
+            seen.add(square)
+            stack = [square]
+            while stack:
+                for neighbour in self._neighbours(stack.pop()):
+                    if self._inside(neighbour) and neighbour not in self._full and neighbour not in seen:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        return regions
+
+    '''----------------------------------------------------
+    * Name: fits_in_empty_rectangle
+    * Function: Says if a block can be placed on a
+    *           location. Precondition: the block has, at
+    *           least, one square.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: True if the block can be placed there.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def fits_in_empty_rectangle(self, location, shape = Shape(1, 1)):
+        return all(self._inside(square) and square not in self._full
+                   for square in self._squares(location, shape))
+
+    '''----------------------------------------------------
+    * Name: fitting_locations
+    * Function: Gives all the locations where a block can
+    *           be placed. Precondition: the block has, at
+    *           least, one square.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def fitting_locations(self, shape):
+        return [Location(i, j) for i in range(0, self._shape.height) for j in range(0, self._shape.width)
+                if self.fits_in_empty_rectangle(Location(i, j), shape)]
+
+    '''----------------------------------------------------
+    * Name: placement_scores
+    * Function: Gives every location where a block can be
+    *           placed and the rows and columns, of the ones
+    *           it covers, that placing it there completes,
+    *           by placing it on a copy of the board. The rows
+    *           are cleared first, so a placement that clears
+    *           rows clears no column. Precondition: the block
+    *           has, at least, one square.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: A list of (Location, rows cleared, columns
+    *         cleared) tuples.
+    ----------------------------------------------------'''
+    def placement_scores(self, shape):
+        scores = []
+        for location in self.fitting_locations(shape):
+            board = ReferenceBoard(self._shape)
+            board._full = self._full | set(self._squares(location, shape))
+            rows = [i for i in board.full_rows() if location.row <= i < location.row + shape.height]
+            columns = [j for j in board.full_columns() if location.column <= j < location.column + shape.width]
+            scores.append((location, len(rows), 0 if rows else len(columns)))
+        return scores
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _squares
+    * Function: Gives the squares covered by a block.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _squares(self, location, shape):
+        return [(i, j) for i in range(location.row, location.row + shape.height)
+                for j in range(location.column, location.column + shape.width)]
+
+    '''----------------------------------------------------
+    * Name: _square
+    * Function: Gives the square of a location, raising an
+    *           IndexError, as the lists of the GameBoard
+    *           class do, if it is out of the board.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the square.
+    * Return: A (row, column) pair.
+    ----------------------------------------------------'''
+    def _square(self, location):
+        if not self._inside((location.row, location.column)):
+            raise IndexError('list index out of range')
+        return (location.row, location.column)
+
+    '''----------------------------------------------------
+    * Name: _inside
+    * Function: Says if a square is on the board.
+    * Parameters: self: Instance of the class.
+    *             square: A (row, column) pair.
+    * Return: True if it is on the board.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def _inside(self, square):
+        return 0 <= square[0] < self._shape.height and 0 <= square[1] < self._shape.width
+
+    '''----------------------------------------------------
+    * Name: _neighbours
+    * Function: Gives the four neighbours of a square, on
+    *           the board or not.
+    * Parameters: self: Instance of the class.
+    *             square: A (row, column) pair.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _neighbours(self, square):
+        i, j = square
+        return [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
+
+    '''----------------------------------------------------
+    * Name: _empty_squares
+    * Function: Gives the empty squares of the board.
+    * Parameters: self: Instance of the class.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _empty_squares(self):
+        return [(i, j) for i in range(0, self._shape.height) for j in range(0, self._shape.width)
+                if (i, j) not in self._full]
+
+'''----------------------------------------------------
+* Name: Game
+* Function: The moves of a game on one implementation of
+*           the rules. The subclasses give the legal
+*           locations of a block, the one the simple
+*           method chooses, the placement of a block and
+*           the drawing of the board, from its squares.
+----------------------------------------------------'''
+class Game:
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: play
+    * Function: Places a block on one of its legal
+    *           locations.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    *             choice: Number from 0 to 1 that chooses
+    *                     the location, so every game
+    *                     chooses the same one if they give
+    *                     the same legal locations.
+    * Return: None if the block cannot be placed.
+    *         Otherwise, a tuple with the location and the
+    *         lines cleared.
+    ----------------------------------------------------'''
+    def play(self, block, choice):
+        locations = self.legal_locations(block)
+        if not locations:
+            return None
+        location = locations[int(choice * len(locations))]
+        return location, self.place_block(location, block)
+
+'''----------------------------------------------------
+* Name: BoardGame
+* Function: A game on a board of the GameBoard classes,
+*           as the MyPlayer class plays it: the legal
+*           locations come from placement_scores, the
+*           simple method scans the locations with
+*           is_empty and the full rows are cleared before
+*           the full columns.
+----------------------------------------------------'''
+class BoardGame(Game):
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             board: The board of the game.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, board):
+        self._board = board
+
+    '''----------------------------------------------------
+    * Name: legal_locations
+    * Function: Gives the locations where a block can be
+    *           placed.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def legal_locations(self, block):
+        return [score[0] for score in self._board.placement_scores(block)]
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Gives the location the simple method
+    *           chooses for a block.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if there is none.
+    ----------------------------------------------------'''
+    def first_fit(self, block):
+        shape = self._board.get_shape()
+        for i in range(0, shape.height):
+            for j in range(0, shape.width):
+                if self._board.is_empty(Location(i, j), block):
+                    return Location(i, j)
+        return None
+
+    '''----------------------------------------------------
+    * Name: place_block
+    * Function: Puts a block and clears the full rows and,
+    *           then, the full columns.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             block: Shape of the block.
+    * Return: The number of lines cleared.
+    ----------------------------------------------------'''
+    def place_block(self, location, block):
+        self._board.put(location, block)
+        rows = self._board.full_rows()
+        self._board.clear_rows(rows)
+        columns = self._board.full_columns()
+        self._board.clear_columns(columns)
+        return len(rows) + len(columns)
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Draws the board.
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def __str__(self):
+        return str(self._board)
+
+'''----------------------------------------------------
+* Name: ListingBoardGame
+* Function: A game on a board that gives its legal
+*           locations with fitting_locations (from the
+*           maximal empty rectangles of the GameBoard
+*           classes, or from all the squares of the
+*           reference board).
+----------------------------------------------------'''
+class ListingBoardGame(BoardGame):
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: legal_locations
+    * Function: Gives the locations where a block can be
+    *           placed.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def legal_locations(self, block):
+        return self._board.fitting_locations(block)
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Gives the location the simple method
+    *           chooses for a block: the first legal one.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if there is none.
+    ----------------------------------------------------'''
+    def first_fit(self, block):
+        locations = self._board.fitting_locations(block)
+        return locations[0] if locations else None
+
+'''----------------------------------------------------
+* Name: BatchGame
+* Function: A game on a batch of one board of the
+*           BatchGameBoard class.
+----------------------------------------------------'''
+class BatchGame(Game):
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, shape):
+        self._batch = BatchGameBoard(1, shape)
+
+    '''----------------------------------------------------
+    * Name: legal_locations
+    * Function: Gives the locations where a block can be
+    *           placed, from the legal_locations mask.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def legal_locations(self, block):
+        rows, columns = self._batch.legal_locations(block)[0].nonzero()
+        return [Location(int(i), int(j)) for i, j in zip(rows, columns)]
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Gives the location the simple method
+    *           chooses for a block.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if there is none.
+    ----------------------------------------------------'''
+    def first_fit(self, block):
+        rows, columns, found = self._batch.first_fit(block)
+        return Location(int(rows[0]), int(columns[0])) if found[0] else None
+
+    '''----------------------------------------------------
+    * Name: place_block
+    * Function: Puts a block and clears the full lines.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             block: Shape of the block.
+    * Return: The number of lines cleared.
+    ----------------------------------------------------'''
+    def place_block(self, location, block):
+        self._batch.place_blocks([location.row], [location.column], block)
+        rows, columns = self._batch.clear_full_lines()
+        return int(rows[0] + columns[0])
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Draws the board.
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def __str__(self):
+        board = self._batch.get_boards()[0]
+        return draw(self._batch.get_shape(), lambda i, j: bool(board[i, j]))
+
+'''----------------------------------------------------
+* Name: BitmaskGame
+* Function: A game on a compact board, played with the
+*           functions of the montecarlo.py file that the
+*           rollouts use.
+----------------------------------------------------'''
+class BitmaskGame(Game):
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, shape):
+        self._shape = shape
+        self._rows = tuple(0 for y in range(shape.height))
+
+    '''----------------------------------------------------
+    * Name: legal_locations
+    * Function: Gives the locations where a block can be
+    *           placed.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def legal_locations(self, block):
+        return montecarlo.legal_locations(self._rows, self._shape, block)
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Gives the location the simple method
+    *           chooses for a block.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if there is none.
+    ----------------------------------------------------'''
+    def first_fit(self, block):
+        return montecarlo.first_location(self._rows, self._shape, block)
+
+    '''----------------------------------------------------
+    * Name: place_block
+    * Function: Puts a block and clears the full lines.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             block: Shape of the block.
+    * Return: The number of lines cleared.
+    ----------------------------------------------------'''
+    def place_block(self, location, block):
+        self._rows, cleared = montecarlo.place(self._rows, self._shape, location, block)
+        return cleared
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Draws the board (its squares are the bits
+    *           of the rows).
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def __str__(self):
+        return draw(self._shape, lambda i, j: self._rows[i] >> j & 1 == 1)
+
+'''----------------------------------------------------
+* Name: PlayerGame
+* Function: A game played through the MyPlayer class
+*           with the simple method: the location the
+*           simple method chooses is the one play gives,
+*           which starts its search from the locations
+*           saved for each shape and rejects the blocks
+*           known not to fit, and the blocks are placed
+*           with place_block, which moves those locations
+*           back after a clear.
+----------------------------------------------------'''
+class PlayerGame(BoardGame):
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    *             lazy_clear: If it is True, the player
+    *                         plays on a LazyGameBoard.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, shape, lazy_clear = False):
+        self._player = MyPlayer(shape.width, shape.height, 'simple', lazy_clear = lazy_clear)
+        BoardGame.__init__(self, self._player._myboard)
+
+    '''----------------------------------------------------
+    * Name: first_fit
+    * Function: Gives the location the simple method
+    *           chooses for a block.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if there is none.
+    ----------------------------------------------------'''
+    def first_fit(self, block):
+        return self._player.play(block)
+
+    '''----------------------------------------------------
+    * Name: place_block
+    * Function: Places a block with the player.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             block: Shape of the block.
+    * Return: The number of lines cleared.
+    ----------------------------------------------------'''
+    def place_block(self, location, block):
+        # The lines a block completes are the ones placement_scores gives.
+        cleared = {score[0]: score[1] + score[2] for score in self._board.placement_scores(block)}
+        self._player.place_block(location, block)
+        return cleared.get(location, 0)
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Draws the board of the player.
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def __str__(self):
+        return str(self._player)
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: draw
+* Function: Draws a board as the __str__ method of the
+*           GameBoard class does: from the highest row to
+*           the lowest one.
+* Parameters: shape: Shape of the board.
+*             is_square_full: Function that says if the
+*                             square of a row and a column
+*                             is occupied.
+* Return: A string.
+----------------------------------------------------'''
+def draw(shape, is_square_full):
+    return '\n'.join(''.join(GameBoard._FULL if is_square_full(i, j) else GameBoard._EMPTY
+                             for j in range(0, shape.width))
+                     for i in range(shape.height - 1, -1, -1))
+
+'''----------------------------------------------------
+* Name: indexed
+* Function: Creates a board of a class with all its
+*           optional indexes (fragmentation metrics and
+*           maximal empty rectangles) being kept, so the
+*           code that updates them is run by every
+*           operation.
+* Parameters: board_class: GameBoard or a subclass.
+* Return: A function that creates the board from its
+*         shape.
+----------------------------------------------------'''
+def indexed(board_class):
+    def create(shape):
+        board = board_class(shape)
+        board.holes()
+        board.empty_rectangles()
+        return board
+    return create
+
+'''----------------------------------------------------
+* Name: random_operations
+* Function: Generates a random sequence of operations of
+*           the boards. Most locations are on the board or
+*           out of it by one row or column, and the others
+*           can be out of it, on any side, by up to
+*           MAX_BLOCK rows and columns. The blocks can have
+*           any width and height from 0 to MAX_BLOCK,
+*           except the ones of the queries answered by the
+*           indexes, which have one square at least.
+* Parameters: generator: Random generator.
+*             shape: Shape of the board.
+*             length: Number of operations.
+* Return: A list of tuples (name of the method,
+*         arguments).
+----------------------------------------------------'''
+def random_operations(generator, shape, length):
+    operations = []
+    for k in range(0, length):
+        margin = 0 if generator.random() < 0.75 else MAX_BLOCK
+        location = Location(generator.randint(-margin, shape.height + margin),
+                            generator.randint(-margin, shape.width + margin))
+        block = Shape(generator.randint(0, MAX_BLOCK), generator.randint(0, MAX_BLOCK))
+        name = generator.choice(['put', 'put', 'put', 'remove', 'clear_rows', 'clear_columns',
+                                 'full_rows', 'full_columns', 'row_counters',
+                                 'column_counters', 'encode', 'is_empty', 'fits_in_empty_rectangle',
+                                 'fitting_locations', 'placement_scores', 'holes',
+                                 'isolated_empty_squares', 'empty_regions'])
+        if name in ('fits_in_empty_rectangle', 'fitting_locations', 'placement_scores'):
+            block = Shape(max(block.width, 1), max(block.height, 1))
+        if name in ('put', 'remove', 'is_empty', 'fits_in_empty_rectangle'):
+            operations.append((name, (location, block)))
+        elif name in ('fitting_locations', 'placement_scores'):
+            operations.append((name, (block,)))
+        elif name == 'clear_rows':
+            operations.append((name, (generator.sample(range(0, shape.height + 1), generator.randint(0, 2)),)))
+        elif name == 'clear_columns':
+            operations.append((name, (generator.sample(range(0, shape.width + 1), generator.randint(0, 2)),)))
+        else:
+            operations.append((name, ()))
+    return operations
+
+'''----------------------------------------------------
+* Name: random_moves
+* Function: Generates a random sequence of operations of
+*           the games, with blocks from 1x1 to MAX_BLOCK x
+*           MAX_BLOCK. Most of them are moves, so the
+*           boards fill up and lines are cleared.
+* Parameters: generator: Random generator.
+*             shape: Shape of the board.
+*             length: Number of operations.
+* Return: A list of tuples (name of the method,
+*         arguments).
+----------------------------------------------------'''
+def random_moves(generator, shape, length):
+    operations = []
+    for k in range(0, length):
+        block = Shape(generator.randint(1, MAX_BLOCK), generator.randint(1, MAX_BLOCK))
+        name = generator.choice(['play', 'play', 'play', 'legal_locations', 'first_fit'])
+        if name == 'play':
+            operations.append((name, (block, generator.random())))
+        else:
+            operations.append((name, (block,)))
+    return operations
+
+# Kinds of board that can be compared, by name. The first one given is the
+# reference for the results and the times.
+BACKENDS = {
+    'ReferenceBoard': ReferenceBoard,
+    'GameBoard': GameBoard,
+    'LazyGameBoard': LazyGameBoard,
+    'IndexedGameBoard': indexed(GameBoard),
+    'IndexedLazyGameBoard': indexed(LazyGameBoard),
+}
+# Implementations of the rules of the game that can be compared, by name.
+GAME_BACKENDS = {
+    'ReferenceGame': lambda shape: ListingBoardGame(ReferenceBoard(shape)),
+    'GameBoardGame': lambda shape: BoardGame(GameBoard(shape)),
+    'LazyGameBoardGame': lambda shape: BoardGame(LazyGameBoard(shape)),
+    'IndexedGameBoardGame': lambda shape: ListingBoardGame(indexed(GameBoard)(shape)),
+    'BatchGame': BatchGame,
+    'BitmaskGame': BitmaskGame,
+    'PlayerGame': PlayerGame,
+    'LazyPlayerGame': lambda shape: PlayerGame(shape, lazy_clear = True),
+}
+# Kinds of board and generator of the operations of each mode.
+MODES = {
+    'boards': (BACKENDS, random_operations),
+    'games': (GAME_BACKENDS, random_moves),
+}
+
+'''----------------------------------------------------
+* Name: create
+* Function: Creates a board of a kind, of either mode.
+* Parameters: name: Name of the kind of board.
+*             shape: Shape of the board.
+* Return: The new board.
+----------------------------------------------------'''
+def create(name, shape):
+    return (BACKENDS[name] if name in BACKENDS else GAME_BACKENDS[name])(shape)
+
+'''----------------------------------------------------
+* Name: apply
+* Function: Runs an operation on a board.
+* Parameters: board: The board.
+*             operation: Tuple (name of the method,
+*                        arguments).
+* Return: The result of the operation (None if it is
+*         the board itself) or the name of the exception
+*         raised, and the drawing of the board after it.
+----------------------------------------------------'''
+def apply(board, operation):
+    name, arguments = operation
+    try:
+        result = getattr(board, name)(*arguments)
+        if result is board: result = None
+    except Exception as error:
+        result = type(error).__name__
+    return result, str(board)
+
+'''----------------------------------------------------
+* Name: first_difference
+* Function: Runs a sequence of operations on new boards
+*           of every kind and looks for the first one
+*           where they differ.
+* Parameters: backends: Names of the kinds of board.
+*             shape: Shape of the boards.
+*             operations: List of operations.
+*             times: If it is given, dictionary where the
+*                    time of each operation on each kind
+*                    of board is added.
+* Return: None if all the boards behave the same.
+*         Otherwise, a tuple with the index of the
+*         operation and the outcome on every board.
+----------------------------------------------------'''
+def first_difference(backends, shape, operations, times = None):
+    boards = [create(name, shape) for name in backends]
+    for index, operation in enumerate(operations):
+        outcomes = []
+        for name, board in zip(backends, boards):
+            start = time.perf_counter()
+            outcomes.append(apply(board, operation))
+            if times is not None:
+                key = (operation[0], name)
+                times[key] = times.get(key, 0) + time.perf_counter() - start
+        if any(outcome != outcomes[0] for outcome in outcomes):
+            return index, outcomes
+    return None
+
+'''----------------------------------------------------
+* Name: shrink
+* Function: Makes a failing sequence of operations as
+*           short as possible: chunks of operations, from
+*           half of the sequence down to single ones, are
+*           removed while the boards still differ.
+* Parameters: backends: Names of the kinds of board.
+*             shape: Shape of the boards.
+*             operations: Failing list of operations.
+* Return: The shortest failing list found.
+----------------------------------------------------'''
+def shrink(backends, shape, operations):
+    # Everything after the first difference is not needed.
+    operations = operations[:first_difference(backends, shape, operations)[0] + 1]
+    chunk = len(operations) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk:]
+            if candidate and first_difference(backends, shape, candidate) is not None:
+                operations = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    return operations
+
+'''----------------------------------------------------
+* Name: fuzz
+* Function: Runs random sequences of operations until
+*           the boards differ or all of them are run.
+* Parameters: backends: Names of the kinds of board.
+*             runs: Number of sequences.
+*             length: Operations of each sequence.
+*             seed: Seed of the random generator.
+*             output: File where the report is written.
+*             mode: Mode of the operations (see MODES).
+* Return: True if all the boards behaved the same.
+*         False otherwise.
+----------------------------------------------------'''
+def fuzz(backends, runs, length, seed, output = sys.stdout, mode = 'boards'):
+    generate = MODES[mode][1]
+    generator = random.Random(seed)
+    times = {}
+    for run in range(0, runs):
+        shape = Shape(generator.randint(1, 8), generator.randint(1, 8))
+        operations = generate(generator, shape, length)
+        if first_difference(backends, shape, operations, times) is not None:
+            operations = shrink(backends, shape, operations)
+            index, outcomes = first_difference(backends, shape, operations)
+            print('Run', run, 'differs on a', str(shape.width) + 'x' + str(shape.height),
+                  'board after', len(operations), 'operations:', file = output)
+            for operation in operations:
+                print('   ', operation[0], operation[1], file = output)
+            for name, (result, state) in zip(backends, outcomes):
+                print('   ', name, 'gives', repr(result), 'with the board:', file = output)
+                for line in state.split('\n'):
+                    print('       ', line, file = output)
+            return False
+    # Time of each operation relative to the first kind of board.
+    print('All', runs, 'runs behaved the same. Time relative to', backends[0] + ':', file = output)
+    names = sorted({key[0] for key in times})
+    column = max(len(name) for name in names) + 2
+    print('    ' + 'operation'.ljust(column) + ''.join(name.rjust(22) for name in backends), file = output)
+    for name in names:
+        reference = times[(name, backends[0])] or 1e-9
+        print('    ' + name.ljust(column) + ''.join(('%.2fx' % (times[(name, backend)] / reference)).rjust(22)
+                                                 for backend in backends), file = output)
+    return True
+
+###########################################################
+#                          MAIN
+###########################################################
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Differential fuzzing of the boards.')
+    parser.add_argument('--mode', default = 'boards', choices = list(MODES),
+                        help = 'operations of the boards or moves of the games')
+    parser.add_argument('--runs', type = int, default = 200, help = 'number of sequences')
+    parser.add_argument('--length', type = int, default = 200, help = 'operations of each sequence')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the random generator')
+    parser.add_argument('--backends', nargs = '+', default = None,
+                        choices = list(BACKENDS) + list(GAME_BACKENDS),
+                        help = 'kinds of board (the first one is the reference), all the ones of the mode by default')
+    options = parser.parse_args()
+    kinds = MODES[options.mode][0]
+    backends = options.backends or list(kinds)
+    if any(name not in kinds for name in backends):
+        parser.error('the backends of the ' + options.mode + ' mode are ' + ', '.join(kinds))
+    sys.exit(0 if fuzz(backends, options.runs, options.length, options.seed, mode = options.mode) else 1)
@@ -66,6 +66,40 @@ class GameBoard:
         # squares on all positions.
         self._board = [[self._EMPTY for x in range(self._shape.width)]
                         for y in range(self._shape.height)]
+        # Number of tockens of each row and of each column, kept up to date by
+        # every change of the board, so the full lines are found without
+        # looking at the squares.
+        self._row_count = [0 for y in range(self._shape.height)]
+        self._column_count = [0 for x in range(self._shape.width)]
+        # Occupied squares of each row, as an integer whose bit j is set if
+        # the square of the column j is occupied (see encode).
+        self._row_bits = [0 for y in range(self._shape.height)]
+        # Occupied squares of each column, as an integer whose bit i is set if
+        # the square of the row i is occupied.
+        self._column_bits = [0 for x in range(self._shape.width)]
+        # Longest run of empty squares of each row and of each column (see
+        # is_unplaceable), the longest of all the rows and of all the columns,
+        # and the line where each of them was found, as an integer with its
+        # bit set. The lines changed since the runs were found, and the ones
+        # of them where a block has been put, whose runs may be shorter, are
+        # kept as integers too, whose bit k is set if the line k has changed.
+        self._row_run = [self._shape.width for y in range(self._shape.height)]
+        self._column_run = [self._shape.height for x in range(self._shape.width)]
+        self._stale_rows = 0
+        self._stale_columns = 0
+        self._shrunk_rows = 0
+        self._shrunk_columns = 0
+        self._widest_run, self._widest_row = self._shape.width, 1 << self._shape.height >> 1
+        self._tallest_run, self._tallest_column = self._shape.height, 1 << self._shape.width >> 1
+        # The fragmentation metrics (see the holes method) are only kept
+        # once they have been asked for the first time.
+        self._tracking = False
+        # Minimal shapes of the blocks known not to fit anywhere (see
+        # is_unplaceable), kept until some square is freed.
+        self._unplaceable = []
+        # Maximal empty rectangles (see empty_rectangles), only kept once they
+        # have been asked for the first time.
+        self._free_rectangles = None
 
     '''----------------------------------------------------
     * Name: __str__
@@ -165,6 +199,7 @@ class GameBoard:
         # Having an empty spot where the user wants to put a tocken(s)
         # is essential to keep going with the task.
         assert self.is_empty(location, shape), 'The locations you are trying to access are already occupied or out of bounds.'
+        if self._tracking: change = self._begin_change(self._block_squares(location, shape))
         # If Shape = (1, 1), the algoithm is O(1).
         # Else, the algorithm is O(w x h), with w the width of the shape given
         # and h its height.
@@ -174,6 +209,9 @@ class GameBoard:
                 # to the value of the position, the chain of chars that
                 # returns the black square.
                 self._board[i][j] = self._FULL
+        self._count_block(location, shape, 1)
+        if self._tracking: self._end_change(change, True)
+        if self._free_rectangles is not None: self._split_free_rectangles(location, shape)
         return self
 
     '''----------------------------------------------------
@@ -194,6 +232,9 @@ class GameBoard:
     *         False otherwise.
     ----------------------------------------------------'''
     def is_empty(self, location, shape = Shape(1, 1)):
+        # A negative row or column is out of the board too, even if the lists
+        # of squares would take it from their end.
+        if location.row < 0 or location.column < 0: return False
         # If Shape = (1, 1), the algoithm is O(1).
         # Else, the algorithm is O(w x h), with w the width of the shape given
         # and h its height.
@@ -229,6 +270,8 @@ class GameBoard:
     *         False otherwise.
     ----------------------------------------------------'''
     def is_full(self, location, shape = Shape(1, 1)):
+        # As in is_empty, a negative row or column is out of the board.
+        if location.row < 0 or location.column < 0: return False
         # If Shape = (1, 1), the algoithm is O(1).
         # Else, the algorithm is O(w x h), with w the width of the shape given
         # and h its height.
@@ -268,6 +311,7 @@ class GameBoard:
         # Having an full spot where the user wants to remove a tocken(s)
         # is essential to keep going with the task.
         assert self.is_full(location, shape), 'There are not tockens to be removed on the positions you are asking for.'
+        if self._tracking: change = self._begin_change(self._block_squares(location, shape))
         # If Shape = (1, 1), the algoithm is O(1).
         # Else, the algorithm is O(w x h), with w the width of the shape given
         # and h its height.
@@ -276,6 +320,11 @@ class GameBoard:
                 # Removing a tocken from a position means to adjudicate
                 # to its value the chain of chars that returns a white square.
                 self._board[i][j] = self._EMPTY
+        self._count_block(location, shape, -1)
+        if self._tracking: self._end_change(change, False)
+        # The squares freed are on the rows of the block (a block without
+        # width frees none).
+        self._squares_freed(rows = range(location.row, location.row + shape.height) if shape.width > 0 else ())
         return self
 
     '''----------------------------------------------------
@@ -283,12 +332,17 @@ class GameBoard:
     * Function: Looks for the rows with all squares
     *           occupied and gives its list.
     * Parameters: self: Instance of the class.
+    *             board, height, width: If they are given,
+    *             the rows are looked for on that board (a
+    *             list of rows of squares) instead of on
+    *             this one.
     * Return: A list of rows with all squares occupied.
     ----------------------------------------------------'''
     def full_rows(self, board = None, height = None, width = None):
-        # If the call of full_rows is directly done the board has not been
-        # transposed, so the variables take their predetermined values.
-        if board is None: board = self._board
+        # On this board, a row is full when its number of tockens is its
+        # width. The algorithm is O(h), with h the height of the board.
+        if board is None:
+            return [i for i in range(0, self._shape.height) if self._row_count[i] == self._shape.width]
         if height is None: height = self._shape.height
         if width is None: width = self._shape.width
 
@@ -306,20 +360,15 @@ class GameBoard:
     '''----------------------------------------------------
     * Name: full_columns
     * Function: Looks for the columns with all squares
-    *           occupied and gives its list by transposing
-    *           the board and calling the full_rows function.
+    *           occupied and gives its list.
     * Parameters: self: Instance of the class.
     * Return: A list of columns with all squares occupied.
     ----------------------------------------------------'''
     def full_columns(self):
-        # To create an algorithm with lower runtime than
-        # O(w x h), with w the width of the board and h its height,
-        # transposing the board to apply a similar algorithm to the one applied
-        # in the function full_rows is necessary.
-        transposed_board = list(map(list, zip(*self._board)))
-        # Then we just need to call the full_rows method with the board transposed.
-        # Then, the algorithm will be O(w), with w the width of the board.
-        return self.full_rows(transposed_board, self._shape.width, self._shape.height)
+        # A column is full when its number of tockens is the height of the
+        # board, so the board does not need to be transposed.
+        # The algorithm is O(w), with w the width of the board.
+        return [j for j in range(0, self._shape.width) if self._column_count[j] == self._shape.height]
 
     '''----------------------------------------------------
     * Name: clear_rows
@@ -338,12 +387,22 @@ class GameBoard:
         # given and w the width of the board.
         for i in rows:
             # If the row given is out of bounds we don't need to do anything.
-            if i >= self._shape.width: pass
+            if i >= self._shape.height: pass
             # For each row, we adjudicate the value of the white square along all
             # its width.
             else:
+                if self._tracking: change = self._begin_change(self._row_squares(i))
                 for j in range(0, self._shape.width):
+                    if self._board[i][j] == self._FULL: self._column_count[j] -= 1
                     self._board[i][j] = self._EMPTY
+                mask = ~(1 << i)
+                self._column_bits[:] = [column & mask for column in self._column_bits]
+                self._row_count[i] = 0
+                self._stale_columns |= self._row_bits[i]
+                self._stale_rows |= 1 << i
+                self._row_bits[i] = 0
+                if self._tracking: self._end_change(change, False)
+                self._squares_freed(rows = [i])
         return self
 
     '''----------------------------------------------------
@@ -367,8 +426,18 @@ class GameBoard:
             # For each column, we adjudicate the value of the white square along all
             # its height.
             else:
+                if self._tracking: change = self._begin_change(self._column_squares(j))
                 for i in range(0, self._shape.height):
+                    if self._board[i][j] == self._FULL:
+                        self._row_count[i] -= 1
+                        self._row_bits[i] &= ~(1 << j)
                     self._board[i][j] = self._EMPTY
+                self._column_count[j] = 0
+                self._stale_rows |= self._column_bits[j]
+                self._stale_columns |= 1 << j
+                self._column_bits[j] = 0
+                if self._tracking: self._end_change(change, False)
+                self._squares_freed(columns = [j])
         return self
 
     '''----------------------------------------------------
@@ -380,22 +449,9 @@ class GameBoard:
     *         each row.
     ----------------------------------------------------'''
     def row_counters(self):
-        tockens = 0 # This variable will save the number of tockens on one row.
-        row_counter = [] # This list will save the number of tockens on each row.
-        # The algorithm is O(w x h), with w the width of the board and h its
-        # height.
-        for i in range (0, self._shape.height):
-            for j in range (0, self._shape.width):
-                # When we find a position with a black square, we add 1 to the
-                # tockens variable.
-                if self._board[i][j] == self._FULL:
-                    tockens += 1
-            # Once we have checked a full row, we save the number of tockens
-            # on it in the list row_counter and reset the tockens
-            # variable to zero, in order to start checking the following row.
-            row_counter.append(tockens)
-            tockens = 0
-        return row_counter
+        # The number of tockens of each row is kept up to date, so a copy of
+        # it is given. The algorithm is O(h), with h the height of the board.
+        return list(self._row_count)
 
     '''----------------------------------------------------
     * Name: column_counters
@@ -406,19 +462,1147 @@ class GameBoard:
     *         each column.
     ----------------------------------------------------'''
     def column_counters(self):
-        tockens = 0 # This variable will save the number of tockens on one column.
-        column_counter = [] # This list will save the number of tockens on each column.
+        # The number of tockens of each column is kept up to date, so a copy
+        # of it is given. The algorithm is O(w), with w the width of the board.
+        return list(self._column_count)
+
+    '''----------------------------------------------------
+    * Name: encode
+    * Function: Gives a compact form of the board, which
+    *           is cheap to store or to send to another
+    *           process.
+    * Parameters: self: Instance of the class.
+    * Return: A tuple with an integer per row, where the
+    *         bit j is set if the square of the column j
+    *         is occupied.
+    ----------------------------------------------------'''
+    def encode(self):
+        # The rows are kept in this form, so the algorithm is O(h), with h the
+        # height of the board.
+        return tuple(self._row_bits)
+
+    '''----------------------------------------------------
+    * Name: load
+    * Function: Puts on the board the tockens of a compact
+    *           board (see encode). Precondition: the board
+    *           is empty and has the same shape.
+    * Parameters: self: Instance of the class.
+    *             rows: Compact board.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def load(self, rows):
+        # The algorithm is O(w x h), with w the width of the board and h its
+        # height.
+        for i, row in enumerate(rows):
+            for j in range(0, self._shape.width):
+                if row >> j & 1:
+                    self.put(Location(i, j))
+        return self
+
+    '''----------------------------------------------------
+    * Name: holes
+    * Function: Counts the holes of the board: the empty
+    *           squares with, at least, one tocken above
+    *           them in the same column. As the rest of the
+    *           fragmentation metrics, it starts being kept
+    *           when it is asked for the first time and,
+    *           from then on, it is updated on every change
+    *           of the board instead of being recomputed.
+    * Parameters: self: Instance of the class.
+    * Return: The number of holes.
+    ----------------------------------------------------'''
+    def holes(self):
+        if not self._tracking: self._start_tracking()
+        return self._holes
+
+    '''----------------------------------------------------
+    * Name: isolated_empty_squares
+    * Function: Counts the empty squares whose four
+    *           neighbours are occupied or out of the board,
+    *           so no block bigger than 1x1 can use them.
+    * Parameters: self: Instance of the class.
+    * Return: The number of isolated empty squares.
+    ----------------------------------------------------'''
+    def isolated_empty_squares(self):
+        if not self._tracking: self._start_tracking()
+        return self._isolated
+
+    '''----------------------------------------------------
+    * Name: empty_regions
+    * Function: Counts the regions of empty squares
+    *           connected by their sides. Each empty square
+    *           keeps the label of its region, updated on
+    *           every change: the squares freed by remove
+    *           and the clears are joined to the regions
+    *           around them, and a put looks for the pieces
+    *           of the region it may have split with a search
+    *           that starts next to the block and stops once
+    *           all the pieces but one are complete (see
+    *           _split_region).
+    * Parameters: self: Instance of the class.
+    * Return: The number of empty regions.
+    ----------------------------------------------------'''
+    def empty_regions(self):
+        if not self._tracking: self._start_tracking()
+        # The algorithm is O(1).
+        return len(self._region_size)
+
+    '''----------------------------------------------------
+    * Name: largest_empty_rectangle
+    * Function: Looks for the empty rectangle of the board
+    *           with the largest area, which is one of the
+    *           maximal empty rectangles (see
+    *           empty_rectangles), so it comes from the ones
+    *           kept up to date by every change of the board.
+    *           With the same area, the one with the lowest
+    *           row, then the lowest column, then the widest
+    *           one is taken.
+    * Parameters: self: Instance of the class.
+    * Return: The Shape of the rectangle (Shape(0, 0) if
+    *         the board is full).
+    ----------------------------------------------------'''
+    def largest_empty_rectangle(self):
+        rectangles = self._get_free_rectangles()
+        if not rectangles: return Shape(0, 0)
+        # The algorithm is O(m), with m the number of maximal rectangles.
+        row, column, end_row, end_column = max(rectangles, key = lambda rectangle: (
+            (rectangle[2] - rectangle[0]) * (rectangle[3] - rectangle[1]),
+            -rectangle[0], -rectangle[1], rectangle[3] - rectangle[1]))
+        return Shape(end_column - column, end_row - row)
+
+    '''----------------------------------------------------
+    * Name: is_unplaceable
+    * Function: Says if a block is known not to fit
+    *           anywhere on the board: it is wider than the
+    *           longest run of empty squares of a row or
+    *           taller than the longest one of a column, or a
+    *           block not wider and not taller than it has
+    *           been marked as unplaceable (see
+    *           mark_unplaceable) since the last time some
+    *           square was freed. While no block has been put
+    *           on the line where a long enough run was found,
+    *           that run is still there, so a block that fits
+    *           in it is answered in O(1). Otherwise, another
+    *           such line is looked for and, only if there is
+    *           none, the runs of the lines changed are found
+    *           again, from the occupied squares of each line
+    *           kept as an integer, so it is cheap enough to
+    *           be asked before every move.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: True if the block cannot be placed.
+    *         False if it is not known.
+    ----------------------------------------------------'''
+    def is_unplaceable(self, shape):
+        if shape.width > self._widest_run or self._shrunk_rows & self._widest_row:
+            self._widest_run, self._widest_row, self._stale_rows, self._shrunk_rows = self._find_run(
+                self._row_run, self._row_bits, self._stale_rows, self._shrunk_rows,
+                self._shape.width, shape.width)
+            if shape.width > self._widest_run: return True
+        if shape.height > self._tallest_run or self._shrunk_columns & self._tallest_column:
+            self._tallest_run, self._tallest_column, self._stale_columns, self._shrunk_columns = self._find_run(
+                self._column_run, self._column_bits, self._stale_columns, self._shrunk_columns,
+                self._shape.height, shape.height)
+            if shape.height > self._tallest_run: return True
+        # The algorithm is O(u), with u the number of minimal shapes saved.
+        for known in self._unplaceable:
+            if known.width <= shape.width and known.height <= shape.height:
+                return True
+        return False
+
+    '''----------------------------------------------------
+    * Name: mark_unplaceable
+    * Function: Saves that a block does not fit anywhere on
+    *           the board, so that it and every block not
+    *           narrower and not shorter than it are
+    *           rejected by is_unplaceable until some square
+    *           is freed. Precondition: the block has been
+    *           checked on every location.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def mark_unplaceable(self, shape):
+        if not self.is_unplaceable(shape):
+            # Only the minimal shapes are kept: the ones bigger than the
+            # new one are already rejected by it.
+            self._unplaceable = [known for known in self._unplaceable
+                                 if known.width < shape.width or known.height < shape.height]
+            self._unplaceable.append(Shape(shape.width, shape.height))
+        return self
+
+    '''----------------------------------------------------
+    * Name: empty_rectangles
+    * Function: Gives the maximal empty rectangles of the
+    *           board: the empty rectangles that cannot grow
+    *           on any side. A block fits on a location if
+    *           and only if it is inside one of them. They
+    *           are found the first time they are asked and,
+    *           from then on, kept up to date: a put splits
+    *           the rectangles it touches (as the MaxRects
+    *           bin packers do), and a cleared row or column,
+    *           or the rows of a block removed, add the
+    *           rectangles that go through them.
+    * Parameters: self: Instance of the class.
+    * Return: A list of (Location, Shape) pairs with the
+    *         lower-left corner and the shape of each
+    *         rectangle.
+    ----------------------------------------------------'''
+    def empty_rectangles(self):
+        return [(Location(row, column), Shape(end_column - column, end_row - row))
+                for row, column, end_row, end_column in self._get_free_rectangles()]
+
+    '''----------------------------------------------------
+    * Name: fits_in_empty_rectangle
+    * Function: Says if a block placed on a location is
+    *           inside one of the maximal empty rectangles,
+    *           which is the same as is_empty but checking
+    *           the rectangles, in O(m) with m the number of
+    *           them, instead of the squares under the block.
+    *           It only pays off for big blocks on boards
+    *           with few rectangles, and, from its first
+    *           call, every put also updates the rectangles.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: True if the block can be placed there.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def fits_in_empty_rectangle(self, location, shape = Shape(1, 1)):
+        end_row = location.row + shape.height
+        end_column = location.column + shape.width
+        # The algorithm is O(m), with m the number of maximal rectangles.
+        for row, column, top, right in self._get_free_rectangles():
+            if row <= location.row and column <= location.column and end_row <= top and end_column <= right:
+                return True
+        return False
+
+    '''----------------------------------------------------
+    * Name: fitting_locations
+    * Function: Gives all the locations where a block can
+    *           be placed, from the maximal empty rectangles
+    *           big enough to keep it.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: A list of locations, from the lowest row
+    *         and, in the same row, the lowest column.
+    ----------------------------------------------------'''
+    def fitting_locations(self, shape):
+        locations = set()
+        # The algorithm is O(m + l), with m the number of maximal rectangles
+        # and l the number of locations given.
+        for row, column, top, right in self._get_free_rectangles():
+            for i in range(row, top - shape.height + 1):
+                for j in range(column, right - shape.width + 1):
+                    locations.add(Location(i, j))
+        return sorted(locations)
+
+    '''----------------------------------------------------
+    * Name: placement_scores
+    * Function: Gives every location where a block can be
+    *           placed, together with the number of rows
+    *           and columns that placing it there would
+    *           clear, without simulating any placement.
+    *           The legal locations come from the occupied
+    *           squares of each row, kept as an integer (see
+    *           encode), so a whole row of locations is
+    *           checked with a few operations on integers.
+    *           The lines cleared come from prefix sums over
+    *           the rows and columns that the block would
+    *           complete, found with the number of tockens
+    *           of each line. As in the place_block method
+    *           of the MyPlayer class, the rows are cleared
+    *           first, so a placement that clears rows
+    *           clears no column.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the block.
+    * Return: A list of (Location, rows cleared, columns
+    *         cleared) tuples, from the lowest row and, in
+    *         the same row, the lowest column.
+    ----------------------------------------------------'''
+    def placement_scores(self, shape):
+        width, height = self._shape.width, self._shape.height
+        # Bit j of across[i] is set if the block, with its left side on the
+        # column j, only covers empty squares of the row i: the empty squares
+        # of the row shifted by each column of the block. The algorithm is
+        # O(h x (w + h')), with w the width of the shape given, h' its height
+        # and h the height of the board, on integers of w' bits, with w' the
+        # width of the board.
+        first_columns = (1 << max(width - shape.width + 1, 0)) - 1
+        across = []
+        for bits in self._row_bits:
+            empty = ~bits
+            fits = first_columns
+            for k in range(0, shape.width):
+                fits &= empty >> k
+            across.append(fits)
+        # Number of rows lower than i (and columns lower than j) that the
+        # block completes if it covers them.
+        completed_rows = [0]
+        for i in range(0, height):
+            completed_rows.append(completed_rows[i] + (self._row_count[i] + shape.width == width))
+        completed_columns = [0]
+        for j in range(0, width):
+            completed_columns.append(completed_columns[j] + (self._column_count[j] + shape.height == height))
+        scores = []
+        for i in range(0, height - shape.height + 1):
+            top = i + shape.height
+            rows = completed_rows[top] - completed_rows[i]
+            # The block fits with its lower side on the row i if it fits on
+            # every row it covers.
+            fits = first_columns
+            for k in range(i, top):
+                fits &= across[k]
+            while fits:
+                j = (fits & -fits).bit_length() - 1
+                fits &= fits - 1
+                columns = 0 if rows else completed_columns[j + shape.width] - completed_columns[j]
+                scores.append((Location(i, j), rows, columns))
+        return scores
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _is_square_full
+    * Function: Says if a square of the board is occupied.
+    * Parameters: self: Instance of the class.
+    *             i: Row of the square.
+    *             j: Column of the square.
+    * Return: True if the square is occupied.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def _is_square_full(self, i, j):
+        return self._board[i][j] == self._FULL
+
+    '''----------------------------------------------------
+    * Name: _count_block
+    * Function: Updates the number of tockens of the rows
+    *           and columns covered by a block, and the
+    *           occupied squares of its rows and columns.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    *             sign: 1 if the block has been put, -1 if
+    *                   it has been removed.
+    * Return: -
+    ----------------------------------------------------'''
+    def _count_block(self, location, shape, sign):
+        # A block without squares covers no line, even if is_empty lets it be
+        # out of the board.
+        if shape.width == 0 or shape.height == 0: return
+        # The algorithm is O(w + h), with w the width of the shape given and
+        # h its height.
+        mask = ((1 << shape.width) - 1) << location.column
+        for i in range(location.row, location.row + shape.height):
+            self._row_count[i] += sign * shape.width
+            if sign > 0: self._row_bits[i] |= mask
+            else: self._row_bits[i] &= ~mask
+        mask = ((1 << shape.height) - 1) << location.row
+        for j in range(location.column, location.column + shape.width):
+            self._column_count[j] += sign * shape.height
+            if sign > 0: self._column_bits[j] |= mask
+            else: self._column_bits[j] &= ~mask
+        columns = ((1 << shape.width) - 1) << location.column
+        self._stale_rows |= mask
+        self._stale_columns |= columns
+        if sign > 0:
+            self._shrunk_rows |= mask
+            self._shrunk_columns |= columns
+
+    '''----------------------------------------------------
+    * Name: _find_run
+    * Function: Looks for a row (or a column) with a run of
+    *           empty squares long enough for a block. The
+    *           lines where no block has been put since their
+    *           runs were found still have them, or longer
+    *           ones if some square has been freed, so they
+    *           are looked at first, from the last line, as
+    *           the searches fill the first ones. If none is
+    *           long enough, the runs of the lines changed are
+    *           found again and the longest of all of them is
+    *           given.
+    * Parameters: self: Instance of the class.
+    *             runs: List of the longest run of each line,
+    *                   which is updated.
+    *             lines: List of the occupied squares of each
+    *                    line, as integers.
+    *             stale: Lines changed, as an integer.
+    *             shrunk: Lines changed by a put, as an
+    *                     integer.
+    *             length: Number of squares of each line.
+    *             size: Length of the block along the lines.
+    * Return: A tuple with the run found, the line where it
+    *         is, as an integer with its bit set (0 if there
+    *         are no lines), and the lines still changed and
+    *         changed by a put.
+    ----------------------------------------------------'''
+    def _find_run(self, runs, lines, stale, shrunk, length, size):
+        # The algorithm is O(n), with n the number of lines, if a line is long
+        # enough, and O(l x log r + n) otherwise, with l the number of lines
+        # changed and r their longest runs.
+        for k in range(len(runs) - 1, -1, -1):
+            if runs[k] >= size and not shrunk >> k & 1:
+                return runs[k], 1 << k, stale, shrunk
+        while stale:
+            k = (stale & -stale).bit_length() - 1
+            stale &= stale - 1
+            runs[k] = self._longest_run(lines[k], length)
+        if not runs: return 0, 0, 0, 0
+        longest = max(runs)
+        return longest, 1 << (len(runs) - 1 - runs[::-1].index(longest)), 0, 0
+
+    '''----------------------------------------------------
+    * Name: _longest_run
+    * Function: Gives the longest run of empty squares of a
+    *           line.
+    * Parameters: self: Instance of the class.
+    *             bits: Occupied squares of the line, as an
+    *                   integer.
+    *             length: Number of squares of the line.
+    * Return: The number of squares of the run.
+    ----------------------------------------------------'''
+    def _longest_run(self, bits, length):
+        # Bit k of starts is set if a run of, at least, run empty squares
+        # starts on the square k. Two starts at a distance not longer than run
+        # make a run longer by that distance, so run is doubled while it can be
+        # and then grown by halves, and the algorithm is O(log r), with r the
+        # length of the longest run.
+        starts = ~bits & ((1 << length) - 1)
+        if not starts: return 0
+        run = 1
+        while starts & (starts >> run):
+            starts &= starts >> run
+            run *= 2
+        step = run // 2
+        while step:
+            if starts & (starts >> step):
+                starts &= starts >> step
+                run += step
+            step //= 2
+        return run
+
+    '''----------------------------------------------------
+    * Name: _squares_freed
+    * Function: Forgets what is known about the blocks that
+    *           do not fit, as it may not be true once some
+    *           square has been freed, and adds the maximal
+    *           empty rectangles that the squares freed make.
+    * Parameters: self: Instance of the class.
+    *             rows: Rows where all the squares freed
+    *                   are.
+    *             columns: Columns where all the squares
+    *                      freed are.
+    * Return: -
+    ----------------------------------------------------'''
+    def _squares_freed(self, rows = (), columns = ()):
+        self._unplaceable = []
+        # Every new maximal rectangle has a square freed, so it goes through
+        # one of the lines given.
+        if self._free_rectangles is not None:
+            for i in rows: self._add_free_rectangles_through(i, True)
+            for j in columns: self._add_free_rectangles_through(j, False)
+
+    '''----------------------------------------------------
+    * Name: _get_free_rectangles
+    * Function: Gives the set of maximal empty rectangles
+    *           (see empty_rectangles), finding them if
+    *           they are not kept. Each one is a tuple
+    *           (row, column, end row, end column), where
+    *           the ends are not included.
+    * Parameters: self: Instance of the class.
+    * Return: A set of tuples.
+    ----------------------------------------------------'''
+    def _get_free_rectangles(self):
+        if self._free_rectangles is None:
+            # Starting from an empty board, every occupied square is put as a
+            # 1x1 block. The algorithm is O(w x h x m), with w the width of
+            # the board, h its height and m the number of maximal rectangles.
+            self._free_rectangles = {(0, 0, self._shape.height, self._shape.width)}
+            for i in range(0, self._shape.height):
+                for j in range(0, self._shape.width):
+                    if self._is_square_full(i, j):
+                        self._split_free_rectangles(Location(i, j), Shape(1, 1))
+        return self._free_rectangles
+
+    '''----------------------------------------------------
+    * Name: _split_free_rectangles
+    * Function: Updates the maximal empty rectangles after
+    *           putting a block. Every rectangle touched by
+    *           the block is replaced by its parts below,
+    *           above, on the left and on the right of the
+    *           block, and the parts inside another
+    *           rectangle are discarded.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: -
+    ----------------------------------------------------'''
+    def _split_free_rectangles(self, location, shape):
+        # A block without width or height does not cover any square.
+        if shape.width <= 0 or shape.height <= 0: return
+        row, column = location.row, location.column
+        end_row, end_column = row + shape.height, column + shape.width
+        touched = [rectangle for rectangle in self._free_rectangles
+                   if rectangle[0] < end_row and row < rectangle[2]
+                   and rectangle[1] < end_column and column < rectangle[3]]
+        parts = set()
+        # The algorithm is O(t x m), with t the number of rectangles touched
+        # and m the number of maximal rectangles.
+        for rectangle in touched:
+            self._free_rectangles.remove(rectangle)
+            bottom, left, top, right = rectangle
+            if bottom < row: parts.add((bottom, left, row, right))
+            if end_row < top: parts.add((end_row, left, top, right))
+            if left < column: parts.add((bottom, left, top, column))
+            if end_column < right: parts.add((bottom, end_column, top, right))
+        # The rectangles not touched are still maximal, so only the parts
+        # need to be checked.
+        for part in parts:
+            if not any(other != part and self._contains(other, part)
+                       for other in self._free_rectangles.union(parts)):
+                self._free_rectangles.add(part)
+
+    '''----------------------------------------------------
+    * Name: _add_free_rectangles_through
+    * Function: Updates the maximal empty rectangles after
+    *           clearing a row or a column: the ones going
+    *           through the line cleared are added, and the
+    *           old ones inside them are discarded.
+    * Parameters: self: Instance of the class.
+    *             line: Row or column cleared.
+    *             is_row: True if the line is a row.
+    * Return: -
+    ----------------------------------------------------'''
+    def _add_free_rectangles_through(self, line, is_row):
+        # Squares are named by their position along the line and across it,
+        # so rows and columns are treated the same way.
+        if is_row:
+            length, depth = self._shape.width, self._shape.height
+            empty = lambda along, across: not self._is_square_full(across, along)
+        else:
+            length, depth = self._shape.height, self._shape.width
+            empty = lambda along, across: not self._is_square_full(along, across)
+        # Number of empty squares before and after the line on each position
+        # (-1 where the square of the line is occupied).
+        before = [-1 for x in range(length)]
+        after = [-1 for x in range(length)]
+        for p in range(0, length):
+            if empty(p, line):
+                k = line - 1
+                while k >= 0 and empty(p, k): k -= 1
+                before[p] = line - 1 - k
+                k = line + 1
+                while k < depth and empty(p, k): k += 1
+                after[p] = k - line - 1
+        added = set()
+        # Each range of positions gives the rectangle as deep as its shortest
+        # position, which is maximal if the positions next to the range cannot
+        # be that deep. The algorithm is O(l^2), with l the length of the line.
+        for start in range(0, length):
+            lowest, highest = depth, depth
+            end = start
+            while end < length and before[end] >= 0:
+                lowest, highest = min(lowest, before[end]), min(highest, after[end])
+                if ((start == 0 or before[start - 1] < lowest or after[start - 1] < highest)
+                        and (end + 1 == length or before[end + 1] < lowest or after[end + 1] < highest)):
+                    if is_row:
+                        added.add((line - lowest, start, line + highest + 1, end + 1))
+                    else:
+                        added.add((start, line - lowest, end + 1, line + highest + 1))
+                end += 1
+        self._free_rectangles = {rectangle for rectangle in self._free_rectangles
+                                 if not any(self._contains(new, rectangle) for new in added)}
+        self._free_rectangles |= added
+
+    '''----------------------------------------------------
+    * Name: _contains
+    * Function: Says if a rectangle is inside another one.
+    * Parameters: self: Instance of the class.
+    *             outer, inner: Rectangles, as tuples
+    *                           (row, column, end row,
+    *                           end column).
+    * Return: True if inner is inside outer.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def _contains(self, outer, inner):
+        return (outer[0] <= inner[0] and outer[1] <= inner[1]
+                and inner[2] <= outer[2] and inner[3] <= outer[3])
+
+    '''----------------------------------------------------
+    * Name: _block_squares
+    * Function: Gives the squares covered by a block.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the block.
+    *             shape: Shape of the block.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _block_squares(self, location, shape):
+        return [(i, j) for i in range(location.row, location.row + shape.height)
+                for j in range(location.column, location.column + shape.width)]
+
+    '''----------------------------------------------------
+    * Name: _row_squares
+    * Function: Gives the occupied squares of a row.
+    * Parameters: self: Instance of the class.
+    *             i: Row of the board.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _row_squares(self, i):
+        return [(i, j) for j in range(0, self._shape.width) if self._is_square_full(i, j)]
+
+    '''----------------------------------------------------
+    * Name: _column_squares
+    * Function: Gives the occupied squares of a column.
+    * Parameters: self: Instance of the class.
+    *             j: Column of the board.
+    * Return: A list of (row, column) pairs.
+    ----------------------------------------------------'''
+    def _column_squares(self, j):
+        return [(i, j) for i in range(0, self._shape.height) if self._is_square_full(i, j)]
+
+    '''----------------------------------------------------
+    * Name: _start_tracking
+    * Function: Computes the fragmentation metrics from
+    *           scratch and starts keeping them.
+    * Parameters: self: Instance of the class.
+    * Return: -
+    ----------------------------------------------------'''
+    def _start_tracking(self):
+        self._tracking = True
+        # Highest occupied row (-1 if there is none) of each column. The holes
+        # of a column are the squares under its highest tocken that are not
+        # occupied, so they are found with the number of tockens of the column.
+        self._column_top = [-1 for x in range(self._shape.width)]
+        # The algorithm is O(w x h), with w the width of the board and h its
+        # height.
+        for i in range(0, self._shape.height):
+            for j in range(0, self._shape.width):
+                if self._is_square_full(i, j):
+                    self._column_top[j] = i
+        self._holes = sum(self._column_top[j] + 1 - self._column_count[j]
+                          for j in range(0, self._shape.width))
+        self._isolated = self._count_isolated(self._block_squares(Location(0, 0), self._shape))
+        # Label of the empty region of each square (numbered as row x width +
+        # column), or -1 if it is occupied, and number of squares of each
+        # region by label. The empty squares are labelled one region at a
+        # time, so they start with the label -2.
+        width = self._shape.width
+        self._label = [-1 if self._is_square_full(i, j) else -2
+                       for i in range(0, self._shape.height) for j in range(0, width)]
+        self._region_size = {}
+        self._next_label = 0
+        for square in range(0, width * self._shape.height):
+            if self._label[square] == -2:
+                self._region_size[self._next_label] = self._relabel(square, -2, self._next_label)
+                self._next_label += 1
+
+    '''----------------------------------------------------
+    * Name: _begin_change
+    * Function: Saves what the fragmentation metrics need
+    *           to know before some squares change.
+    * Parameters: self: Instance of the class.
+    *             squares: List of the (row, column) pairs
+    *                      that are going to be filled or
+    *                      freed.
+    * Return: The information needed by _end_change.
+    ----------------------------------------------------'''
+    def _begin_change(self, squares):
+        # Only the squares that change and their neighbours can become, or
+        # stop being, isolated.
+        around = set(squares)
+        for i, j in squares:
+            for k, l in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 <= k < self._shape.height and 0 <= l < self._shape.width:
+                    around.add((k, l))
+        return squares, around, self._count_isolated(around)
+
+    '''----------------------------------------------------
+    * Name: _end_change
+    * Function: Updates the fragmentation metrics once some
+    *           squares have changed (and the number of
+    *           tockens of the rows and columns has been
+    *           updated). The algorithm is O(s), with s the
+    *           number of squares changed, plus O(h) for each
+    *           column whose highest tocken has been freed.
+    * Parameters: self: Instance of the class.
+    *             change: Information given by
+    *                     _begin_change.
+    *             filled: True if the squares have been
+    *                     filled, False if they have been
+    *                     freed.
+    * Return: -
+    ----------------------------------------------------'''
+    def _end_change(self, change, filled):
+        squares, around, isolated = change
+        self._isolated += self._count_isolated(around) - isolated
+        # Rows changed of each column.
+        columns = {}
+        for i, j in squares:
+            columns.setdefault(j, []).append(i)
+        for j, rows in columns.items():
+            top = self._column_top[j]
+            # The holes of the column before the change.
+            before = self._column_count[j] - (len(rows) if filled else -len(rows))
+            self._holes -= top + 1 - before
+            if filled:
+                top = max(top, max(rows))
+            else:
+                while top >= 0 and not self._is_square_full(top, j):
+                    top -= 1
+            self._column_top[j] = top
+            self._holes += top + 1 - self._column_count[j]
+        width = self._shape.width
+        if filled:
+            # The squares filled leave their regions. A region is only split if
+            # it is next to the block on more than one square.
+            for i, j in squares:
+                square = i * width + j
+                label = self._label[square]
+                self._label[square] = -1
+                self._region_size[label] -= 1
+                if self._region_size[label] == 0: del self._region_size[label]
+            seeds = {}
+            for i, j in squares:
+                for neighbour in self._neighbours(i * width + j):
+                    if self._label[neighbour] != -1:
+                        seeds.setdefault(self._label[neighbour], set()).add(neighbour)
+            for label, around in seeds.items():
+                if len(around) > 1: self._split_region(label, list(around))
+        else:
+            # Each square freed starts a region of its own, joined to the
+            # regions around it.
+            for i, j in squares:
+                square = i * width + j
+                label = self._next_label
+                self._next_label += 1
+                self._label[square] = label
+                self._region_size[label] = 1
+                for neighbour in self._neighbours(square):
+                    other = self._label[neighbour]
+                    if other != -1 and other != label:
+                        label = self._merge_regions(label, square, other, neighbour)
+
+    '''----------------------------------------------------
+    * Name: _count_isolated
+    * Function: Counts the isolated empty squares (see the
+    *           isolated_empty_squares method) of a group.
+    * Parameters: self: Instance of the class.
+    *             squares: Iterable of (row, column) pairs.
+    * Return: The number of isolated empty squares.
+    ----------------------------------------------------'''
+    def _count_isolated(self, squares):
+        isolated = 0
+        for i, j in squares:
+            if not self._is_square_full(i, j) and all(
+                    not (0 <= k < self._shape.height and 0 <= l < self._shape.width)
+                    or self._is_square_full(k, l)
+                    for k, l in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))):
+                isolated += 1
+        return isolated
+
+    '''----------------------------------------------------
+    * Name: _neighbours
+    * Function: Gives the neighbours of a square that are
+    *           on the board.
+    * Parameters: self: Instance of the class.
+    *             square: Number of the square (row x width
+    *                     + column).
+    * Return: A list of numbers of squares.
+    ----------------------------------------------------'''
+    def _neighbours(self, square):
+        width = self._shape.width
+        i, j = divmod(square, width)
+        neighbours = []
+        if i > 0: neighbours.append(square - width)
+        if i < self._shape.height - 1: neighbours.append(square + width)
+        if j > 0: neighbours.append(square - 1)
+        if j < width - 1: neighbours.append(square + 1)
+        return neighbours
+
+    '''----------------------------------------------------
+    * Name: _relabel
+    * Function: Gives a new label to the squares connected
+    *           to one that have its old label.
+    * Parameters: self: Instance of the class.
+    *             square: Number of the square.
+    *             old: Label of the square.
+    *             new: New label.
+    * Return: The number of squares relabelled.
+    ----------------------------------------------------'''
+    def _relabel(self, square, old, new):
+        self._label[square] = new
+        stack = [square]
+        size = 0
+        # The algorithm is O(s), with s the number of squares relabelled.
+        while stack:
+            square = stack.pop()
+            size += 1
+            for neighbour in self._neighbours(square):
+                if self._label[neighbour] == old:
+                    self._label[neighbour] = new
+                    stack.append(neighbour)
+        return size
+
+    '''----------------------------------------------------
+    * Name: _merge_regions
+    * Function: Joins two empty regions, relabelling the
+    *           smaller one.
+    * Parameters: self: Instance of the class.
+    *             first: Label of a region.
+    *             first_square: A square of it.
+    *             second: Label of the other region.
+    *             second_square: A square of it.
+    * Return: The label of the region joined.
+    ----------------------------------------------------'''
+    def _merge_regions(self, first, first_square, second, second_square):
+        if self._region_size[first] > self._region_size[second]:
+            first, first_square, second, second_square = second, second_square, first, first_square
+        # The algorithm is O(s), with s the size of the smaller region.
+        self._relabel(first_square, first, second)
+        self._region_size[second] += self._region_size.pop(first)
+        return second
+
+    '''----------------------------------------------------
+    * Name: _split_region
+    * Function: Looks for the pieces of a region which a
+    *           put may have split. A search grows from each
+    *           of the squares of the region next to the
+    *           block, one square per turn, and two searches
+    *           that meet are joined. A search that cannot
+    *           grow has found a whole piece, which gets a
+    *           new label, and the searches stop when only
+    *           one is left, which keeps the label of the
+    *           region. So the algorithm is O(k x s), with k
+    *           the number of squares next to the block and
+    *           s the size of the second largest piece, and
+    *           it is O(k) when the region has not been
+    *           split and the squares are close to each other.
+    * Parameters: self: Instance of the class.
+    *             label: Label of the region.
+    *             seeds: List of the squares of the region
+    *                    next to the block.
+    * Return: -
+    ----------------------------------------------------'''
+    def _split_region(self, label, seeds):
+        # Search that found each square and search each one has been joined
+        # to (itself if it has not been joined).
+        owner = {seed: k for k, seed in enumerate(seeds)}
+        joined = list(range(len(seeds)))
+        stacks = [[seed] for seed in seeds]
+        found = [[seed] for seed in seeds]
+        active = set(range(len(seeds)))
+        while len(active) > 1:
+            for k in list(active):
+                if len(active) == 1: break
+                # Searches joined during this turn are skipped.
+                if k not in active: continue
+                if not stacks[k]:
+                    # The search has found a whole piece.
+                    active.discard(k)
+                    for square in found[k]:
+                        self._label[square] = self._next_label
+                    self._region_size[self._next_label] = len(found[k])
+                    self._region_size[label] -= len(found[k])
+                    self._next_label += 1
+                    continue
+                for neighbour in self._neighbours(stacks[k].pop()):
+                    if self._label[neighbour] != label: continue
+                    if neighbour not in owner:
+                        owner[neighbour] = k
+                        stacks[k].append(neighbour)
+                        found[k].append(neighbour)
+                        continue
+                    other = owner[neighbour]
+                    while joined[other] != other:
+                        other = joined[other]
+                    if other != k:
+                        joined[other] = k
+                        stacks[k].extend(stacks[other])
+                        found[k].extend(found[other])
+                        active.discard(other)
+
+'''----------------------------------------------------
+* Name: LazyGameBoard
+* Function: A board with the same interface as the
+*           GameBoard one, but where clearing a row or a
+*           column does not write its squares. Every row
+*           and column keeps the generation in which it was
+*           cleared for the last time and every square the
+*           one in which a tocken was put on it. A square is
+*           occupied only if its tocken was put after the
+*           last clear of its row and of its column, so the
+*           squares of a cleared line are not written until
+*           the board is compacted (see compact). A clear
+*           only updates the number of tockens of the lines
+*           that cross it, and is_empty and is_full only
+*           look at the occupied squares of each row kept as
+*           an integer (see encode), so the squares are not
+*           read on the moves of a game.
+----------------------------------------------------'''
+class LazyGameBoard(GameBoard):
+    #************************************
+    # Processes and Functions
+    #************************************
+
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, shape):
+        GameBoard.__init__(self, shape)
+        # Last generation given to a put or to a clear.
+        self._generation = 0
+        # Generation in which a tocken was put on each square.
+        self._square_generation = [[0 for x in range(self._shape.width)]
+                                   for y in range(self._shape.height)]
+        # Generation in which each row and each column were cleared.
+        self._row_generation = [0 for y in range(self._shape.height)]
+        self._column_generation = [0 for x in range(self._shape.width)]
+
+    '''----------------------------------------------------
+    * Name: __str__
+    * Function: Returns the string representation of the
+    *           board (see the GameBoard class).
+    * Parameters: self: Instance of the class.
+    * Return: A string that simulates the current status
+    *         of the board.
+    ----------------------------------------------------'''
+    def __str__(self):
+        # The algorithm is O(w x h), with w the width of the board and h its
+        # height.
+        return '\n'.join(''.join(self._FULL if self._is_square_full(i, j) else self._EMPTY
+                                 for j in range(0, self._shape.width))
+                         for i in range(self._shape.height - 1, -1, -1))
+
+    '''----------------------------------------------------
+    * Name: put
+    * Function: Puts tockens on the board (see the
+    *           GameBoard class). The squares are stamped
+    *           with a new generation.
+    * Parameters: self: Instance of the class.
+    *             location: Location of the tockens.
+    *             shape: Width and height of the block
+    *                    of tockens.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def put(self, location, shape = Shape(1, 1)):
+        assert self.is_empty(location, shape), 'The locations you are trying to access are already occupied or out of bounds.'
+        if self._tracking: change = self._begin_change(self._block_squares(location, shape))
+        self._generation += 1
+        # The algorithm is O(w x h), with w the width of the shape given
+        # and h its height.
+        for i in range(location.row, location.row + shape.height):
+            for j in range(location.column, location.column + shape.width):
+                self._board[i][j] = self._FULL
+                self._square_generation[i][j] = self._generation
+        self._count_block(location, shape, 1)
+        if self._tracking: self._end_change(change, True)
+        if self._free_rectangles is not None: self._split_free_rectangles(location, shape)
+        return self
+
+    '''----------------------------------------------------
+    * Name: is_empty
+    * Function: Says if the position(s) given by the user
+    *           is/are empty or not (see the GameBoard
+    *           class).
+    * Parameters: self: Instance of the class.
+    *             location: Location of the squares.
+    *             shape: Width and height of the squares.
+    * Return: True if the position is empty.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def is_empty(self, location, shape = Shape(1, 1)):
+        row, column = location.row, location.column
+        if row < 0 or column < 0: return False
+        # As in the GameBoard class, a block without squares only looks at
+        # the square of the location.
+        if shape.width == 0 or shape.height == 0:
+            return not self._is_square_full(row, column)
+        if row + shape.height > self._shape.height or column + shape.width > self._shape.width:
+            return False
+        # The occupied squares of each row are kept as an integer (see
+        # encode), so the squares are not looked at. The algorithm is O(h),
+        # with h the height of the shape given.
+        mask = ((1 << shape.width) - 1) << column
+        for bits in self._row_bits[row:row + shape.height]:
+            if bits & mask: return False
+        return True
+
+    '''----------------------------------------------------
+    * Name: is_full
+    * Function: Says if the position(s) given by the user
+    *           is/are occupied or not (see the GameBoard
+    *           class).
+    * Parameters: self: Instance of the class.
+    *             location: Location of the squares.
+    *             shape: Width and height of the squares.
+    * Return: True if the position(s) is/are occupied.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def is_full(self, location, shape = Shape(1, 1)):
+        row, column = location.row, location.column
+        if row < 0 or column < 0: return False
+        if shape.width == 0 or shape.height == 0:
+            return self._is_square_full(row, column)
+        if row + shape.height > self._shape.height or column + shape.width > self._shape.width:
+            return False
+        # As in is_empty, the algorithm is O(h), with h the height of the
+        # shape given.
+        mask = ((1 << shape.width) - 1) << column
+        for bits in self._row_bits[row:row + shape.height]:
+            if bits & mask != mask: return False
+        return True
+
+    '''----------------------------------------------------
+    * Name: remove
+    * Function: Removes tockens from the board (see the
+    *           GameBoard class).
+    * Parameters: self: Instance of the class.
+    *             location: Location of the tockens.
+    *             shape: Width and height of the block
+    *                    of tockens.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def remove(self, location, shape = Shape(1, 1)):
+        assert self.is_full(location, shape), 'There are not tockens to be removed on the positions you are asking for.'
+        if self._tracking: change = self._begin_change(self._block_squares(location, shape))
+        # The algorithm is O(w x h), with w the width of the shape given
+        # and h its height.
+        for i in range(location.row, location.row + shape.height):
+            for j in range(location.column, location.column + shape.width):
+                self._board[i][j] = self._EMPTY
+        self._count_block(location, shape, -1)
+        if self._tracking: self._end_change(change, False)
+        # The squares freed are on the rows of the block (a block without
+        # width frees none).
+        self._squares_freed(rows = range(location.row, location.row + shape.height) if shape.width > 0 else ())
+        return self
+
+    '''----------------------------------------------------
+    * Name: clear_rows
+    * Function: Removes all tokens present in the rows
+    *           that the user gives by stamping them with a
+    *           new generation, so no square is written.
+    * Parameters: self: Instance of the class.
+    *             rows: List of rows the user wants to
+    *                   clear.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def clear_rows(self, rows):
+        # No square is written, but the number of tockens of the columns of
+        # the occupied squares must be updated. They are the bits set of the
+        # row, so the algorithm is O(r x t), with r the length of the list of
+        # rows given and t the number of tockens of each row.
+        full = (1 << self._shape.width) - 1
+        for i in rows:
+            # If the row given is out of bounds we don't need to do anything.
+            if i < self._shape.height:
+                if self._tracking: change = self._begin_change(self._row_squares(i))
+                bits = self._row_bits[i]
+                if bits == full:
+                    # A full row, as the ones cleared on a game, takes a tocken
+                    # from every column, which is faster done on whole lists.
+                    mask = ~(1 << i)
+                    self._column_count[:] = [count - 1 for count in self._column_count]
+                    self._column_bits[:] = [column & mask for column in self._column_bits]
+                    bits = 0
+                while bits:
+                    j = (bits & -bits).bit_length() - 1
+                    bits &= bits - 1
+                    self._column_count[j] -= 1
+                    self._column_bits[j] &= ~(1 << i)
+                self._row_count[i] = 0
+                self._stale_columns |= self._row_bits[i]
+                self._stale_rows |= 1 << i
+                self._row_bits[i] = 0
+                self._generation += 1
+                self._row_generation[i] = self._generation
+                if self._tracking: self._end_change(change, False)
+                self._squares_freed(rows = [i])
+        return self
+
+    '''----------------------------------------------------
+    * Name: clear_columns
+    * Function: Removes all tokens present in the columns
+    *           that the user gives by stamping them with a
+    *           new generation, so no square is written.
+    * Parameters: self: Instance of the class.
+    *             columns: List of columns the user wants
+    *                      to clear.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def clear_columns(self, columns):
+        # As in clear_rows, only the rows of the occupied squares are
+        # updated. They are the bits set of the column, so the algorithm is
+        # O(c x t), with c the length of the list of columns given and t the
+        # number of tockens of each column.
+        full = (1 << self._shape.height) - 1
+        for j in columns:
+            # If the column given is out of bounds we don't need to do anything.
+            if j < self._shape.width:
+                if self._tracking: change = self._begin_change(self._column_squares(j))
+                bit = 1 << j
+                bits = self._column_bits[j]
+                if bits == full:
+                    self._row_count[:] = [count - 1 for count in self._row_count]
+                    self._row_bits[:] = [row ^ bit for row in self._row_bits]
+                    bits = 0
+                while bits:
+                    i = (bits & -bits).bit_length() - 1
+                    bits &= bits - 1
+                    self._row_count[i] -= 1
+                    self._row_bits[i] ^= bit
+                self._column_count[j] = 0
+                self._stale_rows |= self._column_bits[j]
+                self._stale_columns |= bit
+                self._column_bits[j] = 0
+                self._generation += 1
+                self._column_generation[j] = self._generation
+                if self._tracking: self._end_change(change, False)
+                self._squares_freed(columns = [j])
+        return self
+
+    '''----------------------------------------------------
+    * Name: compact
+    * Function: Writes an empty square on every square
+    *           cleared since the last compaction and resets
+    *           all the generations. It does not change the
+    *           state of the board, only how it is kept.
+    * Parameters: self: Instance of the class.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def compact(self):
         # The algorithm is O(w x h), with w the width of the board and h its
         # height.
-        for j in range (0, self._shape.width):
-            for i in range (0, self._shape.height):
-                # When we find a position with a black square, we add 1 to the
-                # tockens variable.
-                if self._board[i][j] == self._FULL:
-                    tockens += 1
-            # Once we have checked a full column, we save the number of tockens
-            # on it in the list column_counter and reset the tockens
-            # variable to zero, in order to start checking the following column.
-            column_counter.append(tockens)
-            tockens = 0
-        return column_counter
+        for i in range(0, self._shape.height):
+            for j in range(0, self._shape.width):
+                full = self._is_square_full(i, j)
+                self._board[i][j] = self._FULL if full else self._EMPTY
+                self._square_generation[i][j] = 1 if full else 0
+        self._generation = 1
+        self._row_generation = [0 for y in range(self._shape.height)]
+        self._column_generation = [0 for x in range(self._shape.width)]
+        return self
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _is_square_full
+    * Function: Says if a square of the board is occupied:
+    *           it has a tocken put after the last clear of
+    *           its row and of its column.
+    * Parameters: self: Instance of the class.
+    *             i: Row of the square.
+    *             j: Column of the square.
+    * Return: True if the square is occupied.
+    *         False otherwise.
+    ----------------------------------------------------'''
+    def _is_square_full(self, i, j):
+        generation = self._square_generation[i][j]
+        return (self._board[i][j] == self._FULL and generation > self._row_generation[i]
+                and generation > self._column_generation[j])
@@ -0,0 +1,342 @@
+'''/////////////////////////////////////////////////////////
+File name: memprofile.py
+File function: Memory profile of the MyPlayer and
+GameBoard classes on a standard game, made with the
+snapshots of tracemalloc. It reports:
+- The footprint of a new board and of a new player (with
+  its board).
+- The memory kept by the player after the game (its
+  board, caches, last blocks seen...): what is freed when
+  the player is deleted.
+- The peak of memory of a move, which includes the
+  transient objects, like the locations and shapes made
+  by the scanning loops. It is measured on a sample of
+  the moves: a snapshot is taken when the move starts and
+  when a function of the board or the player returns with
+  more memory in use than ever before in the move, and
+  the peak of the move is what the last one has over the
+  first one. The peak given is the largest of the sample.
+- A breakdown of all of them by allocation site (the line
+  of the board or the player that made the objects). The
+  breakdown of the peak is the one of the move that gives
+  it, so the sites add up to it.
+A short game is played before measuring, so that what is
+made only once is not counted, and the objects freed but
+kept by the interpreter for reuse (its free lists) are
+released before each snapshot of the footprints, so they
+do not depend on what was run before. The peak does not
+need it, as the snapshots it compares are taken in the
+same move.
+The results can be kept as a baseline (by default, the
+memprofile.json file of this folder), by run parameters
+and version of Python (the sizes of the objects change
+from one version to another),
+and the profile fails (with exit status 1) if any
+footprint grows beyond a tolerance over the baseline of
+the same parameters. A run without a baseline for its
+parameters is not checked.
+Usage: python memprofile.py [--method M] [--moves N]
+       [--seed S] [--top T] [--baseline FILE]
+       [--save-baseline] [--tolerance F]
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library argparse is needed to read the options of the command line.
+import argparse
+# Library gc is needed to release the free lists before the snapshots.
+import gc
+# Library json is needed to keep the baselines.
+import json
+# Library linecache is needed to show the allocation sites.
+import linecache
+# Library os is needed to find the files of this folder.
+import os
+# Library random is needed to generate the blocks.
+import random
+# Library sys is needed to follow the functions and give the exit status.
+import sys
+# Library tracemalloc is needed to measure the memory.
+import tracemalloc
+
+from myplayer import *
+from simulation import random_block
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Standard game: board, method, seed and shape of the biggest block.
+WIDTH = 10
+HEIGHT = 10
+METHOD = 'expert'
+SEED = 0
+MAX_BLOCK = Shape(2, 2)
+MOVES = 1000
+# Moves between two moves whose functions are followed.
+SAMPLE_EVERY = 50
+# Moves of the game played before measuring.
+WARM_UP_MOVES = 20
+# Frames kept by tracemalloc for each allocation, enough to go from the
+# code of the namedtuples to the line that made them.
+FRAMES = 8
+# Growth over the baseline allowed, as a fraction of it.
+TOLERANCE = 0.1
+# Folder of the board and the player and their files, whose lines are the
+# allocation sites and whose functions are followed.
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+# Default file of the baseline.
+BASELINE = os.path.join(FOLDER, 'memprofile.json')
+FOLLOWED = {os.path.join(FOLDER, 'gameboard.py'), os.path.join(FOLDER, 'myplayer.py')}
+# Files of the profile itself.
+PROFILER = {os.path.abspath(__file__), tracemalloc.__file__}
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: site_sizes
+* Function: Adds up the memory of a snapshot by
+*           allocation site: the most recent frame of
+*           each allocation that is in the files of the
+*           board or the player. The allocations made
+*           by this profile (even inside the functions of
+*           the board or the player, when it follows them)
+*           and the ones made only by other files are left
+*           out, and so are the frames that following the
+*           functions makes.
+* Parameters: snapshot: Snapshot of tracemalloc.
+* Return: A dictionary from the sites, as strings
+*         "file:line", to their size in bytes.
+----------------------------------------------------'''
+def site_sizes(snapshot):
+    sizes = {}
+    for trace in snapshot.traces:
+        # The frames go from the oldest to the most recent.
+        for frame in reversed(trace.traceback):
+            if frame.filename in PROFILER:
+                break
+            if frame.filename in FOLLOWED:
+                # The frames of the functions followed become objects when
+                # the profile function is given them (from Python 3.11), and
+                # they are made on the first line of the function.
+                if linecache.getline(frame.filename, frame.lineno).lstrip().startswith('def '):
+                    break
+                site = os.path.basename(frame.filename) + ':' + str(frame.lineno)
+                sizes[site] = sizes.get(site, 0) + trace.size
+                break
+    return sizes
+
+'''----------------------------------------------------
+* Name: difference
+* Function: Gives the memory allocated by site between
+*           two snapshots.
+* Parameters: before: Sizes by site of the first one.
+*             after: Sizes by site of the second one.
+* Return: A dictionary from the sites to the bytes they
+*         grew (only the ones that grew).
+----------------------------------------------------'''
+def difference(before, after):
+    return {site: size - before.get(site, 0) for site, size in after.items() if size > before.get(site, 0)}
+
+'''----------------------------------------------------
+* Name: footprint_sizes
+* Function: Takes a snapshot of the memory, once the
+*           free lists of the interpreter have been
+*           released, and adds it up by allocation site.
+* Parameters: -
+* Return: A dictionary from the sites to their size in
+*         bytes (see site_sizes).
+----------------------------------------------------'''
+def footprint_sizes():
+    # A collection of the oldest generation also empties the free lists.
+    gc.collect()
+    return site_sizes(tracemalloc.take_snapshot())
+
+'''----------------------------------------------------
+* Name: warm_up
+* Function: Plays a short game without measuring it, so
+*           that what is made only once (the imports, the
+*           caches of the interpreter...) is not counted.
+* Parameters: width: Width of the board.
+*             height: Height of the board.
+*             method: Method of the player.
+*             seed: Seed of the random blocks.
+*             max_block: Shape of the biggest block.
+*             moves: Maximum number of moves.
+* Return: -
+----------------------------------------------------'''
+def warm_up(width, height, method, seed, max_block, moves = WARM_UP_MOVES):
+    player = MyPlayer(width, height, method)
+    generator = random.Random(seed)
+    for move in range(0, moves):
+        block = random_block(generator, max_block)
+        location = player.play(block)
+        if location is None:
+            break
+        player.place_block(location, block)
+
+'''----------------------------------------------------
+* Name: baseline_key
+* Function: Gives the key of the baseline of a run, made
+*           of its parameters and of the version of
+*           Python running it.
+* Parameters: width: Width of the board.
+*             height: Height of the board.
+*             method: Method of the player.
+*             seed: Seed of the random blocks.
+*             max_block: Shape of the biggest block.
+*             moves: Maximum number of moves.
+* Return: A string.
+----------------------------------------------------'''
+def baseline_key(width = WIDTH, height = HEIGHT, method = METHOD, seed = SEED, max_block = MAX_BLOCK,
+                 moves = MOVES):
+    return ('board=' + str(width) + 'x' + str(height) + ' method=' + method + ' seed=' + str(seed)
+            + ' max_block=' + str(max_block.width) + 'x' + str(max_block.height) + ' moves=' + str(moves)
+            + ' python=' + str(sys.version_info.major) + '.' + str(sys.version_info.minor))
+
+'''----------------------------------------------------
+* Name: profile
+* Function: Plays the standard game (or another one)
+*           measuring the memory.
+* Parameters: width: Width of the board.
+*             height: Height of the board.
+*             method: Method of the player.
+*             seed: Seed of the random blocks.
+*             max_block: Shape of the biggest block.
+*             moves: Maximum number of moves.
+*             sample_every: Moves between two moves
+*                           measured for the peak.
+* Return: A tuple with a dictionary of footprints in
+*         bytes (board, player, retained and transient)
+*         and a dictionary of sites by footprint.
+----------------------------------------------------'''
+def profile(width = WIDTH, height = HEIGHT, method = METHOD, seed = SEED, max_block = MAX_BLOCK,
+            moves = MOVES, sample_every = SAMPLE_EVERY):
+    warm_up(width, height, method, seed, max_block)
+    tracemalloc.start(FRAMES)
+    try:
+        start = footprint_sizes()
+        board = GameBoard(Shape(width, height))
+        with_board = footprint_sizes()
+        player = MyPlayer(width, height, method)
+        with_player = footprint_sizes()
+        player_sites = difference(with_board, with_player)
+        # Sizes by site when the move measured started, memory in use after
+        # the snapshot of its highest point and what each site had allocated
+        # since the start at that point, while the transient objects were
+        # still alive.
+        move_start = [{}]
+        highest = [0]
+        move_sites = [{}]
+        def follow(frame, event, argument):
+            if event == 'return' and frame.f_code.co_filename in FOLLOWED:
+                if tracemalloc.get_traced_memory()[0] > highest[0]:
+                    move_sites[0] = difference(move_start[0], site_sizes(tracemalloc.take_snapshot()))
+                    # Measured after the snapshot, so it is not counted.
+                    highest[0] = tracemalloc.get_traced_memory()[0]
+        generator = random.Random(seed)
+        transient = {}
+        played = 0
+        while played < moves:
+            block = random_block(generator, max_block)
+            sampled = played % sample_every == 0
+            if sampled:
+                move_start[0] = site_sizes(tracemalloc.take_snapshot())
+                highest[0] = tracemalloc.get_traced_memory()[0]
+                move_sites[0] = {}
+                sys.setprofile(follow)
+            try:
+                location = player.play(block)
+                if location is not None:
+                    player.place_block(location, block)
+            finally:
+                sys.setprofile(None)
+            if sampled and sum(move_sites[0].values()) > sum(transient.values()):
+                transient = move_sites[0]
+            if location is None:
+                break
+            played += 1
+        # The memory kept by the player is the one freed when it is deleted.
+        with_player = footprint_sizes()
+        del player
+        retained = difference(footprint_sizes(), with_player)
+    finally:
+        tracemalloc.stop()
+    sites = {'board': difference(start, with_board),
+             'player': player_sites,
+             'retained': retained,
+             'transient': transient}
+    footprints = {'board': sum(sites['board'].values()),
+                  'player': sum(sites['player'].values()),
+                  'retained': sum(retained.values()),
+                  'transient': sum(transient.values())}
+    return footprints, sites
+
+'''----------------------------------------------------
+* Name: report
+* Function: Writes the footprints and the largest
+*           allocation sites of each one.
+* Parameters: footprints: Footprints given by profile.
+*             sites: Sites given by profile.
+*             top: Number of sites of each footprint.
+*             output: File where the report is written.
+* Return: -
+----------------------------------------------------'''
+def report(footprints, sites, top, output = sys.stdout):
+    names = {'board': 'New GameBoard', 'player': 'New MyPlayer (with its board)',
+             'retained': 'Kept by the player after the game (with its board)', 'transient': 'Peak of a move'}
+    for name in names:
+        print(names[name] + ':', footprints[name], 'bytes', file = output)
+        for site, size in sorted(sites[name].items(), key = lambda item: -item[1])[:top]:
+            file, line = site.split(':')
+            source = linecache.getline(os.path.join(FOLDER, file), int(line)).strip()
+            print('    ' + str(size).rjust(9) + '  ' + site.ljust(18) + source[:60], file = output)
+
+'''----------------------------------------------------
+* Name: check
+* Function: Compares the footprints with a baseline.
+* Parameters: footprints: Footprints given by profile.
+*             baseline: Footprints of the baseline.
+*             tolerance: Growth allowed, as a fraction of
+*                        the baseline.
+* Return: A list with the names of the footprints that
+*         grew beyond the tolerance.
+----------------------------------------------------'''
+def check(footprints, baseline, tolerance = TOLERANCE):
+    return [name for name in baseline if footprints[name] > baseline[name] * (1 + tolerance)]
+
+###########################################################
+#                          MAIN
+###########################################################
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Memory profile of a standard game of the Blocks Puzzle.')
+    parser.add_argument('--method', default = METHOD, help = 'method of the player')
+    parser.add_argument('--moves', type = int, default = MOVES, help = 'maximum number of moves')
+    parser.add_argument('--seed', type = int, default = SEED, help = 'seed of the random blocks')
+    parser.add_argument('--top', type = int, default = 10, help = 'sites shown for each footprint')
+    parser.add_argument('--baseline', default = BASELINE, help = 'file of the baseline footprints')
+    parser.add_argument('--save-baseline', action = 'store_true', help = 'keep the footprints as the baseline')
+    parser.add_argument('--tolerance', type = float, default = TOLERANCE, help = 'growth allowed over the baseline')
+    options = parser.parse_args()
+    footprints, sites = profile(method = options.method, seed = options.seed, moves = options.moves)
+    report(footprints, sites, options.top)
+    # The baselines of the file, by the parameters of their runs.
+    baselines = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baselines = json.load(file)
+    key = baseline_key(method = options.method, seed = options.seed, moves = options.moves)
+    if options.save_baseline:
+        baselines[key] = footprints
+        with open(options.baseline, 'w') as file:
+            json.dump(baselines, file, indent = 4, sort_keys = True)
+        print('Baseline of', key, 'written to', options.baseline + '.')
+    elif key not in baselines:
+        print('There is no baseline of', key + ', so it is not checked.')
+    else:
+        grown = check(footprints, baselines[key], options.tolerance)
+        for name in grown:
+            print('The footprint', name, 'grew beyond the baseline.')
+        sys.exit(1 if grown else 0)
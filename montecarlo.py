@@ -0,0 +1,252 @@
+'''/////////////////////////////////////////////////////////
+File name: montecarlo.py
+File function: Monte Carlo rollouts for the Blocks
+Puzzle. From a board, many random games of a few moves
+are played and the number of moves each one survives is
+averaged, to estimate how good the board is.
+The rollouts are run on a persistent pool of processes,
+so a board is sent to them in its compact form: a tuple
+with an integer per row, where the bit j is set if the
+square of column j is occupied (see the encode method of
+the GameBoard class). All the functions that work with
+compact boards follow the rules of the place_block and
+_simple methods of the MyPlayer class.
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library random is needed to generate the blocks and moves of the rollouts.
+import random
+# Library time is needed to keep the rollouts inside their time budget.
+import time
+# Libraries concurrent.futures and os are needed to run the rollouts on other
+# processes.
+import concurrent.futures
+import os
+
+from gameboard import *
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Number of rollouts run by each task sent to the pool.
+ROLLOUTS_PER_TASK = 8
+# Number of tasks waiting on the pool for each of its processes.
+TASKS_PER_WORKER = 2
+
+###########################################################
+#                        VARIABLES
+###########################################################
+# Pools of processes shared by all the players, by number of processes,
+# created when they are needed.
+_pools = {}
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: get_pool
+* Function: Gives the pool of processes used for the
+*           rollouts with a number of processes, creating
+*           it the first time it is asked. Players with
+*           different numbers of processes keep their own
+*           pools, so they do not recreate each other's.
+* Parameters: workers: Number of processes. If it is not
+*                      specified, one per core.
+* Return: A ProcessPoolExecutor.
+----------------------------------------------------'''
+def get_pool(workers = None):
+    if workers not in _pools:
+        _pools[workers] = concurrent.futures.ProcessPoolExecutor(max_workers = workers)
+    return _pools[workers]
+
+'''----------------------------------------------------
+* Name: legal_locations
+* Function: Gives all the locations where a block can
+*           be placed on a compact board, from the lowest
+*           row and, in the same row, the lowest column.
+* Parameters: rows: Compact board.
+*             shape: Shape of the board.
+*             block: Shape of the block.
+* Return: A list of locations.
+----------------------------------------------------'''
+def legal_locations(rows, shape, block):
+    locations = []
+    mask = (1 << block.width) - 1
+    # The algorithm is O(w x h x b), with w the width of the board, h its
+    # height and b the height of the block.
+    for i in range(0, shape.height - block.height + 1):
+        # Squares occupied on any of the rows covered by the block.
+        covered = 0
+        for k in range(i, i + block.height):
+            covered |= rows[k]
+        for j in range(0, shape.width - block.width + 1):
+            if not covered & (mask << j):
+                locations.append(Location(i, j))
+    return locations
+
+'''----------------------------------------------------
+* Name: first_location
+* Function: Gives the location that the simple method
+*           of the MyPlayer class would choose on a
+*           compact board.
+* Parameters: rows: Compact board.
+*             shape: Shape of the board.
+*             block: Shape of the block.
+* Return: A location, or None if the block cannot be
+*         placed.
+----------------------------------------------------'''
+def first_location(rows, shape, block):
+    mask = (1 << block.width) - 1
+    for i in range(0, shape.height - block.height + 1):
+        covered = 0
+        for k in range(i, i + block.height):
+            covered |= rows[k]
+        for j in range(0, shape.width - block.width + 1):
+            if not covered & (mask << j):
+                return Location(i, j)
+    return None
+
+'''----------------------------------------------------
+* Name: place
+* Function: Places a block on a compact board and clears
+*           the full rows and, then, the full columns.
+*           Precondition: the location is legal.
+* Parameters: rows: Compact board.
+*             shape: Shape of the board.
+*             location: Location of the block.
+*             block: Shape of the block.
+* Return: The new compact board and the number of rows
+*         and columns cleared.
+----------------------------------------------------'''
+def place(rows, shape, location, block):
+    rows = list(rows)
+    full = (1 << shape.width) - 1
+    mask = ((1 << block.width) - 1) << location.column
+    for i in range(location.row, location.row + block.height):
+        rows[i] |= mask
+    cleared = 0
+    for i in range(0, shape.height):
+        if rows[i] == full:
+            rows[i] = 0
+            cleared += 1
+    # The columns still full are the bits set on every row.
+    columns = full
+    for row in rows:
+        columns &= row
+    if columns:
+        cleared += bin(columns).count('1')
+        rows = [row & ~columns for row in rows]
+    return tuple(rows), cleared
+
+'''----------------------------------------------------
+* Name: rollouts
+* Function: Plays random games from a compact board and
+*           counts how many moves they survive. It is the
+*           function run by the processes of the pool. It
+*           plays, at least, one game, and no game is
+*           started once the deadline is over, so a task
+*           that cannot be cancelled still ends soon after
+*           it.
+* Parameters: rows: Compact board.
+*             shape: Shape of the board.
+*             blocks: Blocks the random blocks are taken
+*                     from.
+*             horizon: Maximum number of moves of a game.
+*             greedy: If it is True, the blocks are placed
+*                     as the simple method does. Otherwise,
+*                     on a random legal location.
+*             count: Maximum number of games.
+*             seed: Seed of the random games.
+*             deadline: Time (as given by time.time, which
+*                       all the processes share) when the
+*                       games must stop.
+* Return: A tuple with the total number of moves
+*         survived and the number of games played.
+----------------------------------------------------'''
+def rollouts(rows, shape, blocks, horizon, greedy, count, seed, deadline):
+    generator = random.Random(seed)
+    survived = 0
+    for game in range(0, count):
+        if game > 0 and time.time() >= deadline:
+            return survived, game
+        board = rows
+        for move in range(0, horizon):
+            block = generator.choice(blocks)
+            if greedy:
+                location = first_location(board, shape, block)
+            else:
+                locations = legal_locations(board, shape, block)
+                location = generator.choice(locations) if locations else None
+            if location is None: break
+            board = place(board, shape, location, block)[0]
+            survived += 1
+    return survived, count
+
+'''----------------------------------------------------
+* Name: expected_survival
+* Function: Estimates, for each of some boards, how many
+*           moves a game survives from it. Rollouts are
+*           sent to the pool, in tasks of
+*           ROLLOUTS_PER_TASK, until the time budget is
+*           over, so the more processes the pool has, the
+*           more rollouts are run. Every board gets, at
+*           least, one game. The tasks still running when
+*           the budget is over, which cannot be cancelled,
+*           stop at the end of their current game.
+* Parameters: boards: List of compact boards.
+*             shape: Shape of the boards.
+*             blocks: Blocks the random blocks are taken
+*                     from.
+*             time_budget: Seconds to spend.
+*             horizon: Maximum number of moves of a game.
+*             greedy: Policy of the games (see rollouts).
+*             generator: Random generator of the seeds.
+*             workers: Number of processes of the pool.
+* Return: A list with the average number of moves
+*         survived from each board.
+----------------------------------------------------'''
+def expected_survival(boards, shape, blocks, time_budget, horizon = 10,
+                      greedy = True, generator = random, workers = None):
+    pool = get_pool(workers)
+    deadline = time.time() + time_budget
+    blocks = tuple(blocks)
+    survived = [0 for board in boards]
+    games = [0 for board in boards]
+    pending = {}
+    # Sends a new task for the board given.
+    def submit(index):
+        seed = generator.getrandbits(32)
+        future = pool.submit(rollouts, boards[index], shape, blocks, horizon,
+                             greedy, ROLLOUTS_PER_TASK, seed, deadline)
+        pending[future] = index
+    for index in range(0, len(boards)):
+        submit(index)
+    # The boards take turns to get new tasks, keeping the pool busy until
+    # the time budget is over.
+    turn = 0
+    limit = TASKS_PER_WORKER * (workers or os.cpu_count() or 1)
+    while pending:
+        # Once the time budget is over, we only wait for the boards that
+        # have not got any result yet.
+        remaining = deadline - time.time()
+        done, _ = concurrent.futures.wait(pending, timeout = remaining if remaining > 0 else None,
+                                          return_when = concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            moves, played = future.result()
+            survived[index] += moves
+            games[index] += played
+        if time.time() < deadline:
+            while len(pending) < limit:
+                submit(turn % len(boards))
+                turn += 1
+        elif all(games):
+            # The tasks still waiting are not needed anymore, and the ones
+            # running stop by themselves at the deadline.
+            for future in pending:
+                future.cancel()
+            break
+    return [survived[index] / games[index] for index in range(0, len(boards))]
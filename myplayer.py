@@ -28,11 +28,20 @@ Date: 09_03_2021
 ###########################################################
 #                         IMPORTS
 ###########################################################
+# Library random is needed to seed the rollouts of the montecarlo method.
+import random
+# Library collections is needed to keep the last blocks seen.
+import collections
+
 from gameboard import *
+import montecarlo
+import openingbook
 
 ###########################################################
 #                        CONSTANTS
 ###########################################################
+# Number of last blocks seen that the rollouts take their blocks from.
+BLOCK_HISTORY = 100
 
 ###########################################################
 #                          TYPES
@@ -56,22 +65,62 @@ class MyPlayer:
     *             width: Width of the board.
     *             height: Height of the board.
     *             method: Method the user wants to apply.
-    *             Only two methods are available (simple
-    *             and expert). Simple method is the
+    *             Only three methods are available (simple,
+    *             expert and montecarlo). Simple method is the
     *             predetermined. Precondition: the method
     *             asked to be implemented must be avaiable,
     *             otherwise the function gives an assertion
     *             error.
+    *             lazy_clear: If it is True, the board is a
+    *             LazyGameBoard, which clears rows and
+    *             columns without writing their squares.
+    *             False by default.
+    *             rollout_time: Seconds that the montecarlo
+    *             method spends on each move.
+    *             rollout_candidates: Number of locations
+    *             evaluated by the montecarlo method.
+    *             rollout_workers: Number of processes that
+    *             run the rollouts (one per core if it is
+    *             not specified).
+    *             opening_book: File of an opening book of
+    *             the same method (see the openingbook.py
+    *             file). If it is given, the first moves
+    *             are read from it when it has them.
+    *             tracer: If it is given, a Tracer (see the
+    *             tracing.py file) that records the moves.
     * Return: -
     ----------------------------------------------------'''
-    def __init__(self, width, height, method = 'simple'):
+    def __init__(self, width, height, method = 'simple', lazy_clear = False,
+                 rollout_time = 0.1, rollout_candidates = 4, rollout_workers = None,
+                 opening_book = None, tracer = None):
         # If the method asked to be implemented is not avaiable, the user cannot play.
-        assert method in ['simple', 'expert'], 'The method you want to apply is not available.'
+        assert method in ['simple', 'expert', 'montecarlo'], 'The method you want to apply is not available.'
         # The board will be simulated by a board of the class GameBoard (see the
         # gameboard.py file to get more information about the class).
-        self._myboard = GameBoard(Shape(width, height))
+        self._myboard = (LazyGameBoard if lazy_clear else GameBoard)(Shape(width, height))
         # The method to be implemented is the one given.
         self._method = method
+        # Parameters of the montecarlo method and the last blocks it has seen,
+        # which are the ones used to simulate the following moves.
+        self._rollout_time = rollout_time
+        self._rollout_candidates = rollout_candidates
+        self._rollout_workers = rollout_workers
+        self._seen_blocks = collections.deque(maxlen = BLOCK_HISTORY)
+        self._random = random.Random()
+        # For each shape of block, the lowest location (from the lowest row
+        # and, in the same row, the lowest column) where it could still fit.
+        # The simple searches start from it instead of from (0, 0).
+        self._first_fit = {}
+        # File of the opening book, the book itself, which is read on the
+        # first move, and the number of moves played.
+        self._opening_book_path = opening_book
+        self._opening_book = None
+        self._moves = 0
+        # The tracer replaces the methods traced on this player and its board.
+        self._tracer = tracer
+        if tracer is not None:
+            tracer.attach_player(self, lambda: self._myboard)
+            tracer.attach_board(self._myboard)
 
     '''----------------------------------------------------
     * Name: __str__
@@ -115,13 +164,21 @@ class MyPlayer:
         # The clear_rows algorithm is O(r x w), with r the length of the list
         # of full rows given and w the width of the board.
         # The full_rows algorithm is O(h), with h the height of the board.
-        self._myboard.clear_rows(self._myboard.full_rows())
+        full_rows = self._myboard.full_rows()
+        self._myboard.clear_rows(full_rows)
 
         # The clear_columns algorithm is O(c x h), with c the length of the
         # list of full columns given and h the height of the board.
         # The full_columns algorithm is O(w), with w the width of the board.
-        self._myboard.clear_columns(self._myboard.full_columns())
+        full_columns = self._myboard.full_columns()
+        self._myboard.clear_columns(full_columns)
+
+        # Clearing frees squares, so some blocks can fit again before the
+        # location their search would start from.
+        if full_rows or full_columns:
+            self._rewind_first_fit(full_rows, full_columns)
 
+        self._moves += 1
         return self
 
     '''----------------------------------------------------
@@ -140,11 +197,60 @@ class MyPlayer:
     * Return: The best location to put the given block.
     ----------------------------------------------------'''
     def play(self, block):
+        # A block known not to fit anywhere is rejected without searching
+        # (see the is_unplaceable method of the GameBoard class).
+        if self._myboard.is_unplaceable(block):
+            return None
+        # On the first moves, the location can be read from the opening book.
+        if self._opening_book_path is not None:
+            location = self._book_move(block)
+            if location is not None:
+                return location
         if self._method == 'simple':
             return self._simple(block)
+        elif self._method == 'montecarlo':
+            return self._monte_carlo(block)
         else:
             return self._expert(block)
 
+    '''----------------------------------------------------
+    * Name: get_state
+    * Function: Gives everything the player needs to go on
+    *           with a game later on: the board, in its
+    *           compact form, the locations saved for the
+    *           simple searches, the last blocks seen and
+    *           the state of its random generator.
+    * Parameters: self: Instance of the class.
+    * Return: A dictionary that can be pickled.
+    ----------------------------------------------------'''
+    def get_state(self):
+        return {'board': self._myboard.encode(),
+                'first_fit': [(tuple(shape), tuple(start)) for shape, start in self._first_fit.items()],
+                'seen_blocks': [tuple(block) for block in self._seen_blocks],
+                'random': self._random.getstate(),
+                'moves': self._moves}
+
+    '''----------------------------------------------------
+    * Name: set_state
+    * Function: Restores a state given by get_state. The
+    *           player must have been created with the same
+    *           board shape and method.
+    * Parameters: self: Instance of the class.
+    *             state: Dictionary given by get_state.
+    * Return: The object itself.
+    ----------------------------------------------------'''
+    def set_state(self, state):
+        # The board is created again, of the same class, with the tockens saved.
+        self._myboard = type(self._myboard)(self._myboard.get_shape()).load(state['board'])
+        self._first_fit = {Shape(*shape): Location(*start) for shape, start in state['first_fit']}
+        self._seen_blocks.clear()
+        self._seen_blocks.extend(Shape(*block) for block in state['seen_blocks'])
+        self._random.setstate(state['random'])
+        self._moves = state['moves']
+        if self._tracer is not None:
+            self._tracer.attach_board(self._myboard)
+        return self
+
     '''----------------------------------------------------
     * Name: is_legal
     * Function: Cheks if the object given is a block with
@@ -200,12 +306,16 @@ class MyPlayer:
         # to allocate the block has been found or not.
         # The algorithm is O(w x h), with w the width of the board and h its
         # height.
-        i = -1
+        # The locations before the one saved for this shape are known not to
+        # fit, so the search resumes from it.
+        start = self._first_fit.get(block, Location(0, 0))
+        i = start.row - 1
+        first_j = start.column - 1 # Only used on the first row searched.
         # We search an empty spot starting from the lower-left corner and ending
         # to the upper-right one.
         while not found_place and i < board_shape.height:
             i += 1
-            j = -1
+            j, first_j = first_j, -1
             while not found_place and j < board_shape.width:
                 j += 1
                 # If we find an empty spot where the block can be placed,
@@ -213,6 +323,10 @@ class MyPlayer:
                 # The algorithm of the method is_empty (from GameBoard class) is
                 # O(w x h), with w the width of the block given and h its height.
                 found_place = self._myboard.is_empty(Location(i, j), block)
+        self._first_fit[block] = Location(i, j) if found_place else Location(board_shape.height, 0)
+        # All the locations have been checked, so the block does not fit
+        # anywhere (neither do the blocks at least as wide and as high).
+        if not found_place: self._myboard.mark_unplaceable(block)
         return Location(i, j) if found_place else None
 
     '''----------------------------------------------------
@@ -235,8 +349,132 @@ class MyPlayer:
         # return self._simple_into_four_quarters(block)
         # return self._looking_for_completing_rows_and_columns(block)
         # return self._searching_priorizing_rows(block)
+        # return self._greedy_line_clearing(block)
         return self._searching_priorizing_columns(block)
 
+    '''----------------------------------------------------
+    * Name: _monte_carlo
+    * Function: Given a board and a new block, finds a
+    *           location to place the block. The locations
+    *           that clear more rows and columns (and, then,
+    *           the lowest ones) are the candidates. From
+    *           the board each candidate leaves, rollouts of
+    *           the next moves are played on the pool of
+    *           processes (see the montecarlo.py file), and
+    *           the candidate with the best expected
+    *           survival is picked.
+    * Parameters: self: Instance of the class.
+    *             block: An object of type Shape. It
+    *                    represents a set of united
+    *                    tockens that need to be placed.
+    * Return: The best location to put the given block.
+    ----------------------------------------------------'''
+    def _monte_carlo(self, block):
+        board_shape = self._myboard.get_shape()
+        # The board is sent to the processes in its compact form.
+        rows = self._myboard.encode()
+        self._seen_blocks.append(block)
+        locations = montecarlo.legal_locations(rows, board_shape, block)
+        if not locations:
+            self._myboard.mark_unplaceable(block)
+            return None
+        # Board left by each location and number of lines it clears. The
+        # sort keeps the order of the locations with the same lines cleared.
+        results = [montecarlo.place(rows, board_shape, location, block) for location in locations]
+        candidates = sorted(range(len(locations)), key=lambda k: -results[k][1])[:self._rollout_candidates]
+        if len(candidates) == 1:
+            return locations[candidates[0]]
+        survival = montecarlo.expected_survival([results[k][0] for k in candidates], board_shape,
+                                                self._seen_blocks, self._rollout_time,
+                                                generator = self._random, workers = self._rollout_workers)
+        # With the same expected survival, the first candidate is kept.
+        best = max(range(len(candidates)), key=lambda k: survival[k])
+        return locations[candidates[best]]
+
+    '''----------------------------------------------------
+    * Name: _greedy_line_clearing
+    * Function: Given a board and a new block, finds a
+    *           location to place the block. From all the
+    *           possible locations, picks the one that
+    *           clears more rows and columns and, among
+    *           them, the one the simple method would pick.
+    *           All the locations are scored at once by the
+    *           placement_scores method of the GameBoard
+    *           class, without simulating any placement.
+    * Parameters: self: Instance of the class.
+    *             block: An object of type Shape. It
+    *                    represents a set of united
+    *                    tockens that need to be placed.
+    * Return: The best location to put the given block.
+    ----------------------------------------------------'''
+    def _greedy_line_clearing(self, block):
+        # The algorithm is O(w x h), with w the width of the board and h its
+        # height.
+        scores = self._myboard.placement_scores(block)
+        if not scores:
+            self._myboard.mark_unplaceable(block)
+            return None
+        # With the same lines cleared, max keeps the first location.
+        return max(scores, key=lambda score: score[1] + score[2])[0]
+
+    '''----------------------------------------------------
+    * Name: _book_move
+    * Function: Reads the location of a block from the
+    *           opening book, reading the book if it is the
+    *           first time it is needed.
+    * Parameters: self: Instance of the class.
+    *             block: Shape of the block.
+    * Return: The location, or None if the moves covered
+    *         by the book are over, the book does not have
+    *         the board and the block or the block does not
+    *         fit on the location it gives.
+    ----------------------------------------------------'''
+    def _book_move(self, block):
+        if self._opening_book is None:
+            # The book is only kept once it is known to be of this method.
+            book = openingbook.get_book(self._opening_book_path)
+            assert book.get_method() == self._method, 'The opening book given is of another method.'
+            self._opening_book = book
+        if self._moves >= self._opening_book.get_depth():
+            return None
+        # The algorithm is O(w x h), with w the width of the board and h its
+        # height, to make the compact board.
+        location = self._opening_book.lookup(self._myboard.get_shape(), self._myboard.encode(), block)
+        # A stale book, or another board with the same key, could give a
+        # location where the block does not fit; then the block is searched.
+        if location is not None and not self._myboard.is_empty(location, block):
+            return None
+        # The montecarlo method must still see the block for its rollouts.
+        if location is not None and self._method == 'montecarlo':
+            self._seen_blocks.append(block)
+        return location
+
+    '''----------------------------------------------------
+    * Name: _rewind_first_fit
+    * Function: Moves back the locations where the simple
+    *           searches start (see _simple) after some rows
+    *           and columns have been cleared. A block can
+    *           only fit again on the locations that cover a
+    *           freed square, so the location of a shape only
+    *           moves back if the first of them is before it.
+    * Parameters: self: Instance of the class.
+    *             rows: List of the rows cleared.
+    *             columns: List of the columns cleared.
+    * Return: -
+    ----------------------------------------------------'''
+    def _rewind_first_fit(self, rows, columns):
+        lowest_row = min(rows) if rows else None
+        lowest_column = min(columns) if columns else None
+        # The algorithm is O(s), with s the number of shapes saved.
+        for shape, start in self._first_fit.items():
+            # A cleared row frees all its squares, and a cleared column all
+            # the squares of the board's rows.
+            if lowest_row is not None:
+                start = min(start, Location(max(0, lowest_row - shape.height + 1), 0))
+            if lowest_column is not None:
+                start = min(start, Location(0, max(0, lowest_column - shape.width + 1)))
+            self._first_fit[shape] = start
+
     #************************************
     # Functions I tried to construct
     # for the expert algoithm.
@@ -268,23 +506,30 @@ class MyPlayer:
         # I first thought it could make a better optimization of the space,
         # but at the end it allocates the same amount of blocks than the
         # simple algorithm.
-        i = -1
+        # As both halves are searched in the same order as the simple method
+        # does, the search resumes from the same location saved for the shape.
+        start = self._first_fit.get(block, Location(0, 0))
+        i = start.row - 1
+        first_j = start.column - 1 # Only used on the first row searched.
         while not found_place and i <= board_shape.height / 2:
             i += 1
-            j = -1
+            j, first_j = first_j, -1
             while not found_place and j <= board_shape.width:
                 j += 1
                 found_place = self._myboard.is_empty(Location(i, j), block)
         if found_place:
+            self._first_fit[block] = Location(i, j)
             return Location(i, j)
         while not found_place and i <= board_shape.height:
             i += 1
-            j = -1
+            j, first_j = first_j, -1
             while not found_place and j <= board_shape.width:
                 j += 1
                 found_place = self._myboard.is_empty(Location(i, j), block)
+        self._first_fit[block] = Location(i, j) if found_place else Location(board_shape.height, 0)
         if found_place:
             return Location(i, j)
+        self._myboard.mark_unplaceable(block)
 
     '''----------------------------------------------------
     * Name: _simple_into_two_halves
@@ -0,0 +1,265 @@
+'''/////////////////////////////////////////////////////////
+File name: openingbook.py
+File function: Opening books of the Blocks Puzzle. The
+first moves of a game, on an empty or nearly empty board,
+are the same on many games, so they can be found once,
+offline, and kept on a file. A book maps each key (shape
+of the board, hash of the compact board, shape of the
+block) to the location chosen by a method of the MyPlayer
+class, for all the boards that the method can reach on
+its first moves with blocks up to a given shape.
+The file starts with a header (a magic string, the
+version of the format, the number of moves covered and
+the name of the method) followed by fixed-size binary
+records, one per key.
+Usage: python openingbook.py WIDTH HEIGHT OUTPUT
+       [--method M] [--depth D] [--max-block W H]
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library argparse is needed to read the options of the command line.
+import argparse
+# Library hashlib is needed to hash the boards.
+import hashlib
+# Library struct is needed to read and write the binary records.
+import struct
+
+from gameboard import *
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# First bytes of a book file and version of its format.
+MAGIC = b'BPOB'
+VERSION = 1
+# Header: magic, version, number of moves covered and length of the name
+# of the method, which goes after it.
+HEADER = struct.Struct('<4sBHB')
+# Record: width and height of the board, hash of the board, width and
+# height of the block and row and column of the location.
+RECORD = struct.Struct('<HHQHHHH')
+# Size in bytes of the hash of a board.
+HASH_SIZE = 8
+
+###########################################################
+#                         CLASSES
+###########################################################
+class OpeningBook:
+    #************************************
+    # Private variables
+    #************************************
+
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             method: Method of the player that chose
+    *                     the locations.
+    *             depth: Number of first moves covered.
+    *             moves: Dictionary from the keys (see
+    *                    key) to the locations chosen.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, method, depth, moves = None):
+        self._method = method
+        self._depth = depth
+        self._moves = {} if moves is None else moves
+
+    '''----------------------------------------------------
+    * Name: __len__
+    * Function: Gives the number of keys of the book.
+    * Parameters: self: Instance of the class.
+    * Return: An integer.
+    ----------------------------------------------------'''
+    def __len__(self):
+        return len(self._moves)
+
+    '''----------------------------------------------------
+    * Name: get_method
+    * Function: Gives the method of the player that chose
+    *           the locations.
+    * Parameters: self: Instance of the class.
+    * Return: A string.
+    ----------------------------------------------------'''
+    def get_method(self):
+        return self._method
+
+    '''----------------------------------------------------
+    * Name: get_depth
+    * Function: Gives the number of first moves covered.
+    * Parameters: self: Instance of the class.
+    * Return: An integer.
+    ----------------------------------------------------'''
+    def get_depth(self):
+        return self._depth
+
+    '''----------------------------------------------------
+    * Name: key
+    * Function: Gives the key of a board and a block.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    *             rows: Compact board.
+    *             block: Shape of the block.
+    * Return: A tuple.
+    ----------------------------------------------------'''
+    def key(self, shape, rows, block):
+        return (shape.width, shape.height, board_hash(rows, shape.width), block.width, block.height)
+
+    '''----------------------------------------------------
+    * Name: add
+    * Function: Adds the location chosen for a block on a
+    *           board.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    *             rows: Compact board.
+    *             block: Shape of the block.
+    *             location: Location chosen.
+    * Return: -
+    ----------------------------------------------------'''
+    def add(self, shape, rows, block, location):
+        self._moves[self.key(shape, rows, block)] = location
+
+    '''----------------------------------------------------
+    * Name: lookup
+    * Function: Gives the location chosen for a block on a
+    *           board.
+    * Parameters: self: Instance of the class.
+    *             shape: Shape of the board.
+    *             rows: Compact board.
+    *             block: Shape of the block.
+    * Return: The location, or None if the book does not
+    *         have it.
+    ----------------------------------------------------'''
+    def lookup(self, shape, rows, block):
+        return self._moves.get(self.key(shape, rows, block))
+
+    '''----------------------------------------------------
+    * Name: save
+    * Function: Writes the book on a file.
+    * Parameters: self: Instance of the class.
+    *             path: File of the book.
+    * Return: -
+    ----------------------------------------------------'''
+    def save(self, path):
+        name = self._method.encode()
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self._depth, len(name)) + name)
+            for (width, height, board, block_width, block_height), location in sorted(self._moves.items()):
+                file.write(RECORD.pack(width, height, board, block_width, block_height,
+                                       location.row, location.column))
+
+    '''----------------------------------------------------
+    * Name: load
+    * Function: Reads a book from a file.
+    * Parameters: path: File of the book.
+    * Return: An OpeningBook.
+    ----------------------------------------------------'''
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, depth, length = HEADER.unpack_from(data)
+        assert magic == MAGIC and version == VERSION, 'The file given is not an opening book.'
+        method = data[HEADER.size:HEADER.size + length].decode()
+        moves = {}
+        for width, height, board, block_width, block_height, row, column in RECORD.iter_unpack(
+                data[HEADER.size + length:]):
+            moves[(width, height, board, block_width, block_height)] = Location(row, column)
+        return OpeningBook(method, depth, moves)
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: board_hash
+* Function: Hashes a compact board (see the encode
+*           method of the GameBoard class).
+* Parameters: rows: Compact board.
+*             width: Width of the board.
+* Return: An integer of HASH_SIZE bytes.
+----------------------------------------------------'''
+def board_hash(rows, width):
+    size = (width + 7) // 8
+    data = b''.join(row.to_bytes(size, 'little') for row in rows)
+    return int.from_bytes(hashlib.blake2b(data, digest_size = HASH_SIZE).digest(), 'little')
+
+# Books already read, by file, so that all the players share them.
+_books = {}
+
+'''----------------------------------------------------
+* Name: get_book
+* Function: Gives the book of a file, reading it only the
+*           first time it is asked.
+* Parameters: path: File of the book.
+* Return: An OpeningBook.
+----------------------------------------------------'''
+def get_book(path):
+    if path not in _books:
+        _books[path] = OpeningBook.load(path)
+    return _books[path]
+
+'''----------------------------------------------------
+* Name: build_book
+* Function: Builds the book of a method: starting from
+*           the empty board, every block up to a shape is
+*           played on every board reached, until the
+*           number of moves asked.
+* Parameters: width: Width of the board.
+*             height: Height of the board.
+*             method: Method of the player.
+*             depth: Number of first moves covered.
+*             max_block: Shape of the biggest block.
+*             player_options: Other options of the player
+*                             (see the MyPlayer class).
+* Return: An OpeningBook.
+----------------------------------------------------'''
+def build_book(width, height, method = 'simple', depth = 3, max_block = Shape(3, 3), **player_options):
+    # Imported here because the MyPlayer class reads the books of this file.
+    from myplayer import MyPlayer
+    shape = Shape(width, height)
+    book = OpeningBook(method, depth)
+    blocks = [Shape(w, h) for w in range(1, max_block.width + 1) for h in range(1, max_block.height + 1)]
+    player = MyPlayer(width, height, method, **player_options)
+    start = player.get_state()
+    boards = {start['board']}
+    # The number of boards is O(b^d), with b the number of blocks and d
+    # the depth.
+    for move in range(0, depth):
+        following = set()
+        for rows in boards:
+            for block in blocks:
+                if book.lookup(shape, rows, block) is not None:
+                    continue
+                start['board'] = rows
+                player.set_state(start)
+                location = player.play(block)
+                if location is None:
+                    continue
+                book.add(shape, rows, block, location)
+                player.place_block(location, block)
+                following.add(player.get_state()['board'])
+        boards = following
+    return book
+
+###########################################################
+#                          MAIN
+###########################################################
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Builds an opening book of the Blocks Puzzle.')
+    parser.add_argument('width', type = int, help = 'width of the board')
+    parser.add_argument('height', type = int, help = 'height of the board')
+    parser.add_argument('output', help = 'file of the book')
+    parser.add_argument('--method', default = 'simple', help = 'method of the player')
+    parser.add_argument('--depth', type = int, default = 3, help = 'number of first moves covered')
+    parser.add_argument('--max-block', type = int, nargs = 2, default = [3, 3], metavar = ('W', 'H'),
+                        help = 'shape of the biggest block')
+    options = parser.parse_args()
+    book = build_book(options.width, options.height, options.method, options.depth, Shape(*options.max_block))
+    book.save(options.output)
+    print('Book of', len(book), 'moves written to', options.output + '.')
@@ -0,0 +1,175 @@
+'''/////////////////////////////////////////////////////////
+File name: simulation.py
+File function: Simulation of games of the Blocks Puzzle
+played by the MyPlayer class, one by one or in batches.
+The blocks of a game are read from a sequence given by
+the user or generated by a random generator from a seed.
+Long games can keep periodic checkpoints (see the
+checkpoint.py file) with the state of the player, the
+state of the random generator and the position on the
+sequence of blocks. A game started again with the same
+checkpoint file goes on from its last checkpoint and
+gives the same result as if it had never stopped (except
+for the montecarlo method, whose rollouts depend on the
+time they are given).
+Usage: python simulation.py WIDTH HEIGHT [--method M]
+       [--games G] [--seed S] [--max-moves N]
+       [--checkpoint-dir DIR] [--checkpoint-every K]
+       [--trace FILE] [--trace-sample RATE]
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library argparse is needed to read the options of the command line.
+import argparse
+# Library hashlib is needed to tell the sequences of blocks apart.
+import hashlib
+# Library os is needed to name the checkpoint files of a batch.
+import os
+# Library random is needed to generate the blocks.
+import random
+
+from myplayer import *
+from checkpoint import save_checkpoint, load_checkpoint
+from tracing import Tracer
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Moves between two checkpoints of a game.
+CHECKPOINT_EVERY = 1000
+
+###########################################################
+#                        FUNCTIONS
+###########################################################
+'''----------------------------------------------------
+* Name: random_block
+* Function: Generates a random block.
+* Parameters: generator: Random generator.
+*             max_block: Shape of the biggest block.
+* Return: A Shape with random width and height between
+*         1 and the ones of max_block.
+----------------------------------------------------'''
+def random_block(generator, max_block):
+    return Shape(generator.randint(1, max_block.width), generator.randint(1, max_block.height))
+
+'''----------------------------------------------------
+* Name: blocks_hash
+* Function: Hashes a sequence of blocks, so that a
+*           checkpoint can tell if it was kept by a game
+*           with the same blocks.
+* Parameters: blocks: Sequence of blocks.
+* Return: A string with the hash in hexadecimal.
+----------------------------------------------------'''
+def blocks_hash(blocks):
+    data = b''.join(width.to_bytes(2, 'little') + height.to_bytes(2, 'little') for width, height in blocks)
+    return hashlib.blake2b(data, digest_size = 8).hexdigest()
+
+'''----------------------------------------------------
+* Name: play_game
+* Function: Plays a game until a block cannot be placed,
+*           the blocks given are over or the maximum
+*           number of moves is reached.
+* Parameters: width: Width of the board.
+*             height: Height of the board.
+*             method: Method of the player.
+*             seed: Seed of the random blocks.
+*             blocks: Sequence of blocks. If it is given,
+*                     the blocks are not random.
+*             max_block: Shape of the biggest random block.
+*             max_moves: Maximum number of moves.
+*             checkpoint_path: File of the checkpoints. If
+*                              it is not given, the game
+*                              keeps no checkpoint.
+*             checkpoint_every: Moves between checkpoints.
+*             player_options: Other options of the player
+*                             (see the MyPlayer class).
+* Return: A dictionary with the number of moves played
+*         and the compact final board.
+----------------------------------------------------'''
+def play_game(width, height, method = 'simple', seed = 0, blocks = None, max_block = Shape(3, 3),
+              max_moves = None, checkpoint_path = None, checkpoint_every = CHECKPOINT_EVERY,
+              **player_options):
+    # A checkpoint can only be used by the same game: the same options and
+    # the same blocks, and the same maximum of moves, since the result kept
+    # depends on it.
+    game = {'width': width, 'height': height, 'method': method, 'seed': seed,
+            'max_block': tuple(max_block), 'max_moves': max_moves,
+            'blocks': None if blocks is None else blocks_hash(blocks)}
+    player = MyPlayer(width, height, method, **player_options)
+    generator = random.Random(seed)
+    position = 0 # Number of blocks read.
+    saved = load_checkpoint(checkpoint_path) if checkpoint_path else None
+    if saved is not None:
+        assert saved['game'] == game, 'The checkpoint given belongs to another game.'
+        if 'result' in saved:
+            return saved['result']
+        player.set_state(saved['player'])
+        generator.setstate(saved['generator'])
+        position = saved['position']
+    while (max_moves is None or position < max_moves) and (blocks is None or position < len(blocks)):
+        block = random_block(generator, max_block) if blocks is None else blocks[position]
+        location = player.play(block)
+        if location is None:
+            break
+        player.place_block(location, block)
+        position += 1
+        if checkpoint_path and position % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, {'game': game, 'player': player.get_state(),
+                                              'generator': generator.getstate(), 'position': position})
+    result = {'moves': position, 'board': player.get_state()['board']}
+    # The last checkpoint keeps the result, so the game is not played again.
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, {'game': game, 'result': result})
+    return result
+
+'''----------------------------------------------------
+* Name: play_batch
+* Function: Plays a game for each seed given. With a
+*           checkpoint folder, each game keeps its own
+*           checkpoint file on it, so a batch started again
+*           skips the games already finished and goes on
+*           with the others from their last checkpoints.
+* Parameters: width: Width of the boards.
+*             height: Height of the boards.
+*             seeds: Seeds of the games.
+*             checkpoint_dir: Folder of the checkpoints.
+*             options: Other options of the games (see
+*                      play_game).
+* Return: A list with the result of each game.
+----------------------------------------------------'''
+def play_batch(width, height, seeds, checkpoint_dir = None, **options):
+    results = []
+    for seed in seeds:
+        path = os.path.join(checkpoint_dir, 'game-' + str(seed) + '.checkpoint') if checkpoint_dir else None
+        results.append(play_game(width, height, seed = seed, checkpoint_path = path, **options))
+    return results
+
+###########################################################
+#                          MAIN
+###########################################################
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Simulation of games of the Blocks Puzzle.')
+    parser.add_argument('width', type = int, help = 'width of the board')
+    parser.add_argument('height', type = int, help = 'height of the board')
+    parser.add_argument('--method', default = 'simple', help = 'method of the player')
+    parser.add_argument('--games', type = int, default = 1, help = 'number of games')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the first game')
+    parser.add_argument('--max-moves', type = int, default = None, help = 'maximum moves of a game')
+    parser.add_argument('--checkpoint-dir', default = None, help = 'folder of the checkpoints')
+    parser.add_argument('--checkpoint-every', type = int, default = CHECKPOINT_EVERY,
+                        help = 'moves between checkpoints')
+    parser.add_argument('--trace', default = None, help = 'file of the trace of the moves (Chrome format)')
+    parser.add_argument('--trace-sample', type = float, default = 1.0, help = 'fraction of the moves traced')
+    options = parser.parse_args()
+    tracer = Tracer(sample_rate = options.trace_sample) if options.trace else None
+    results = play_batch(options.width, options.height, range(options.seed, options.seed + options.games),
+                         options.checkpoint_dir, method = options.method, max_moves = options.max_moves,
+                         checkpoint_every = options.checkpoint_every, tracer = tracer)
+    if tracer is not None:
+        tracer.write(options.trace)
+    for seed, result in zip(range(options.seed, options.seed + options.games), results):
+        print('Game', seed, 'played', result['moves'], 'moves.')
+    print('Total:', sum(result['moves'] for result in results), 'moves.')
@@ -0,0 +1,254 @@
+'''/////////////////////////////////////////////////////////
+File name: tracing.py
+File function: Tracing of the moves of the MyPlayer
+class. A tracer given to a player (see its tracer option)
+records a span for each call of its play and place_block
+methods and for the board operations called inside them
+(the is_empty scans, full_rows, full_columns, put and the
+clears). The span
+of a move has the shape of the block and the fill level of
+the board as attributes.
+Only a sample of the moves is recorded and the spans are
+kept on a ring buffer, which drops the oldest ones when it
+is full, so the cost and the memory of a tracer are
+bounded and it can be left on: the board operations are
+only replaced during the moves recorded, so the other ones
+run the methods of the board as they are. The spans are
+written in the Chrome trace format, which Perfetto and
+the chrome://tracing page can open.
+Date: 19_10_2026
+/////////////////////////////////////////////////////////'''
+
+###########################################################
+#                         IMPORTS
+###########################################################
+# Library collections is needed for the ring buffer.
+import collections
+# Library json is needed to write the traces.
+import json
+# Library os is needed to give the process of the spans.
+import os
+# Library random is needed to sample the moves.
+import random
+# Library time is needed to measure the spans.
+import time
+# Library weakref is needed to forget the boards that are no longer used.
+import weakref
+
+###########################################################
+#                        CONSTANTS
+###########################################################
+# Number of spans kept by default.
+CAPACITY = 100000
+# Methods of the players and the boards that are traced.
+PLAYER_METHODS = ['play', 'place_block']
+BOARD_METHODS = ['is_empty', 'full_rows', 'full_columns', 'put', 'clear_rows', 'clear_columns']
+
+###########################################################
+#                         CLASSES
+###########################################################
+class Tracer:
+    #************************************
+    # Private variables
+    #************************************
+
+    #************************************
+    # Processes and Functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: __init__
+    * Function: Init of the class.
+    * Parameters: self: Instance of the class.
+    *             capacity: Number of spans kept.
+    *             sample_rate: Fraction of the moves
+    *                          recorded, from 0 to 1.
+    *             seed: Seed of the sampling.
+    * Return: -
+    ----------------------------------------------------'''
+    def __init__(self, capacity = CAPACITY, sample_rate = 1.0, seed = None):
+        # Each span is a tuple (name, start and duration in nanoseconds,
+        # attributes), so that recording it is cheap.
+        self._spans = collections.deque(maxlen = capacity)
+        self._sample_rate = sample_rate
+        self._random = random.Random(seed)
+        # If the current move is being recorded, and the depth of the spans
+        # open, which is 0 outside the traced methods.
+        self._sampled = False
+        self._depth = 0
+        # Boards attached, and if their operations are replaced now.
+        self._boards = weakref.WeakSet()
+        self._tracing_boards = False
+
+    '''----------------------------------------------------
+    * Name: __len__
+    * Function: Gives the number of spans kept.
+    * Parameters: self: Instance of the class.
+    * Return: An integer.
+    ----------------------------------------------------'''
+    def __len__(self):
+        return len(self._spans)
+
+    '''----------------------------------------------------
+    * Name: attach_player
+    * Function: Traces the play and place_block methods of
+    *           a player. A call of play starts a new move,
+    *           which is recorded or not depending on the
+    *           sampling, and the place_block after it
+    *           belongs to the same move.
+    * Parameters: self: Instance of the class.
+    *             player: Instance of the MyPlayer class.
+    *             get_board: Function that gives the board
+    *                        of the player.
+    * Return: -
+    ----------------------------------------------------'''
+    def attach_player(self, player, get_board):
+        play, place_block = player.play, player.place_block
+        def traced_play(*args, **kwargs):
+            if self._depth == 0:
+                self._sampled = self._random.random() < self._sample_rate
+                self._trace_boards(self._sampled)
+            if not self._sampled:
+                return play(*args, **kwargs)
+            # The fill level is only computed on the moves recorded.
+            board = get_board()
+            shape = board.get_shape()
+            fill = sum(board.row_counters()) / (shape.width * shape.height)
+            block = args[0] if args else kwargs['block']
+            return self._record('play', play, args, kwargs, {'block': list(block), 'fill': round(fill, 4)})
+        def traced_place_block(*args, **kwargs):
+            if not self._sampled:
+                return place_block(*args, **kwargs)
+            location = args[0] if args else kwargs['location']
+            shape = args[1] if len(args) > 1 else kwargs['shape']
+            return self._record('place_block', place_block, args, kwargs,
+                                {'block': list(shape), 'location': list(location)})
+        # The methods are replaced on the instance, so other players are
+        # not affected.
+        player.play, player.place_block = traced_play, traced_place_block
+
+    '''----------------------------------------------------
+    * Name: attach_board
+    * Function: Traces the operations of a board. They are
+    *           only replaced, and recorded, during the
+    *           moves recorded.
+    * Parameters: self: Instance of the class.
+    *             board: Instance of the GameBoard class
+    *                    (or of a subclass).
+    * Return: -
+    ----------------------------------------------------'''
+    def attach_board(self, board):
+        self._boards.add(board)
+        if self._tracing_boards:
+            self._replace_operations(board)
+
+    '''----------------------------------------------------
+    * Name: chrome_trace
+    * Function: Gives the spans kept in the Chrome trace
+    *           format, as complete events with times in
+    *           microseconds.
+    * Parameters: self: Instance of the class.
+    * Return: A dictionary that can be written as JSON.
+    ----------------------------------------------------'''
+    def chrome_trace(self):
+        process = os.getpid()
+        events = [{'name': name, 'cat': 'player' if name in PLAYER_METHODS else 'board', 'ph': 'X',
+                   'ts': start / 1000, 'dur': duration / 1000, 'pid': process, 'tid': 0,
+                   'args': attributes}
+                  for name, start, duration, attributes in self._spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ns'}
+
+    '''----------------------------------------------------
+    * Name: write
+    * Function: Writes the spans kept on a file, in the
+    *           Chrome trace format.
+    * Parameters: self: Instance of the class.
+    *             path: File of the trace.
+    * Return: -
+    ----------------------------------------------------'''
+    def write(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+
+    #************************************
+    # Private functions
+    #************************************
+    '''----------------------------------------------------
+    * Name: _trace_boards
+    * Function: Replaces the operations of the boards
+    *           attached by the ones that record them, or
+    *           gives them back their own methods.
+    * Parameters: self: Instance of the class.
+    *             tracing: True to replace them, False to
+    *                      give them back.
+    * Return: -
+    ----------------------------------------------------'''
+    def _trace_boards(self, tracing):
+        if tracing == self._tracing_boards:
+            return
+        for board in self._boards:
+            if tracing:
+                self._replace_operations(board)
+            else:
+                # Without the attributes of the instance, the methods of the
+                # class are found again.
+                for name in BOARD_METHODS:
+                    delattr(board, name)
+        self._tracing_boards = tracing
+
+    '''----------------------------------------------------
+    * Name: _replace_operations
+    * Function: Replaces the operations of a board by the
+    *           ones that record them.
+    * Parameters: self: Instance of the class.
+    *             board: Instance of the GameBoard class
+    *                    (or of a subclass).
+    * Return: -
+    ----------------------------------------------------'''
+    def _replace_operations(self, board):
+        # The methods are replaced on the instance, so other boards are not
+        # affected.
+        for name in BOARD_METHODS:
+            setattr(board, name, self._traced(name, getattr(board, name)))
+
+    '''----------------------------------------------------
+    * Name: _traced
+    * Function: Gives a board operation that records a
+    *           span when it is called inside a move
+    *           recorded.
+    * Parameters: self: Instance of the class.
+    *             name: Name of the operation.
+    *             method: Bound method of the board.
+    * Return: A function.
+    ----------------------------------------------------'''
+    def _traced(self, name, method):
+        def traced(*args, **kwargs):
+            if not self._sampled or self._depth == 0:
+                return method(*args, **kwargs)
+            # The shape of the block, or the number of lines cleared.
+            attributes = {}
+            if name in ('is_empty', 'put'):
+                attributes['block'] = list(args[1] if len(args) > 1 else kwargs.get('shape', (1, 1)))
+            elif name.startswith('clear'):
+                attributes['lines'] = len(args[0] if args else kwargs['rows' if name == 'clear_rows' else 'columns'])
+            return self._record(name, method, args, kwargs, attributes)
+        return traced
+
+    '''----------------------------------------------------
+    * Name: _record
+    * Function: Calls a method and keeps its span.
+    * Parameters: self: Instance of the class.
+    *             name: Name of the span.
+    *             method: Method called.
+    *             args: Positional arguments of the method.
+    *             kwargs: Keyword arguments of the method.
+    *             attributes: Attributes of the span.
+    * Return: The result of the method.
+    ----------------------------------------------------'''
+    def _record(self, name, method, args, kwargs, attributes):
+        self._depth += 1
+        start = time.perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._spans.append((name, start, time.perf_counter_ns() - start, attributes))
+            self._depth -= 1